@@ -1,39 +1,26 @@
-#!/usr/bin/env python
+#!/usr/bin/env python3
+
+# Converts the built files from ISO-8859-1 to UTF-8 with the charset and
+# transcode passes of cfvocab.postprocess, which skip files that already
+# declare UTF-8.
 
 import os
-import subprocess
 import sys
 
-if len(sys.argv) < 3:
-    print 'Usage: encode.py <location> <file_extension>'
-    sys.exit(1)
-    
-loc = sys.argv[1]
-ext = sys.argv[2]
-
-
-for file in os.listdir(loc):
-
-    # Skip if suffix doesn't match given extension.
-    suffix = file[len(file)-len(ext):]
-    if suffix != ext:
-        continue
-
-    # Replace encoding string in <meta> tag.
-    fullpath = os.path.join(loc,file)
-    cmd = 'replace charset=ISO-8859-1 charset=utf-8 -- %s'%fullpath
-    p = subprocess.Popen(cmd, shell=True)
-    p.wait()
-
-    # Convert encoding in a temporary file.
-    tempname = '%s.utf-8'%fullpath
-    cmd = 'iconv -f iso-8859-1 -t utf-8 %s > %s'%(fullpath,tempname)
-    p = subprocess.Popen(cmd, shell=True)
-    p.wait()
-
-    # Replace temporary with original.
-    cmd = 'mv %s %s'%(tempname,fullpath)
-    p = subprocess.Popen(cmd, shell=True)
-    p.wait()
-    
-        
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', '..', 'tools'))
+
+from cfvocab import postprocess
+
+USAGE = 'Usage: encode.py <location> <file_extension>'
+
+
+def main(args):
+    if len(args) < 2:
+        print(USAGE)
+        return 1
+    return postprocess.main(['--passes', 'charset,transcode'] + args[:2])
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
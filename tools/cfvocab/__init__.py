@@ -0,0 +1,3 @@
+"""
+Python tools for building and querying the CF vocabularies under Data/.
+"""
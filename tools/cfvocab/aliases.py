@@ -0,0 +1,160 @@
+"""
+Alias resolution index across standard name table versions.
+
+Each <alias> in a table only says which entry it refers to in that version,
+and that entry may itself have become an alias in a later version. The index
+follows these chains through every version to the standard names of the
+latest version, and stores the result as one flat JSON object:
+
+    {"version": latest label, "aliases": {alias id: [standard name, ...]}}
+
+An alias usually resolves to one standard name; an alias that was split
+resolves to several, and one whose chain ends in a name that is no longer in
+the table resolves to none.
+"""
+
+import argparse
+import json
+import sys
+
+from .fileutil import atomic_write
+from .loader import Alias, iter_table, iter_versions
+
+
+def resolve_aliases(sources):
+    """Return (latest entries, closure) for table files in release order.
+
+    closure maps every alias id published in any of the tables to the sorted
+    tuple of standard names in the last table that it resolves to. Where
+    versions disagree about an alias, the latest definition wins.
+    """
+    entries, closure, _ = resolve_history(sources)
+    return entries, closure
+
+
+def resolve_history(sources):
+    """Return (latest entries, closure, published) for table files.
+
+    As resolve_aliases(), and published is the set of every entry id in any
+    of the tables.
+    """
+    targets = {}
+    entries = set()
+    published = set()
+    for source in sources:
+        entries = set()
+        defined = {}
+        for record in iter_table(source):
+            if type(record) is Alias:
+                defined.setdefault(record.id, set()).add(record.entry_id)
+            else:
+                entries.add(record.id)
+        targets.update(defined)
+        published |= entries
+
+    closure = {}
+
+    def resolve(name, visiting):
+        if name in entries:
+            return {name}
+        if name in closure:
+            return set(closure[name])
+        if name in visiting or name not in targets:
+            return set()
+        visiting.add(name)
+        found = set()
+        for target in targets[name]:
+            found |= resolve(target, visiting)
+        visiting.discard(name)
+        return found
+
+    for name in targets:
+        if name not in entries:
+            closure[name] = tuple(sorted(resolve(name, set())))
+    return entries, closure, published
+
+
+def build_index(root, path):
+    """Write the alias index of every version under root to path."""
+    versions = list(iter_versions(root))
+    _, closure = resolve_aliases(source for _, source in versions)
+    with atomic_write(path, 'w', encoding='utf-8') as f:
+        json.dump({'version': versions[-1][0],
+                   'aliases': dict((name, list(closure[name]))
+                                   for name in sorted(closure))},
+                  f, indent=0, separators=(',', ':'))
+    return len(closure)
+
+
+class AliasIndex(object):
+    """Constant-time alias lookups from an index written by build_index()."""
+
+    def __init__(self, path):
+        with open(path, encoding='utf-8') as f:
+            index = json.load(f)
+        self.version = index['version']
+        self._aliases = dict((name, tuple(targets))
+                             for name, targets in index['aliases'].items())
+
+    def __len__(self):
+        return len(self._aliases)
+
+    def __contains__(self, name):
+        return name in self._aliases
+
+    def resolve(self, name):
+        """Return the standard names an alias resolves to.
+
+        Returns None if name is not an alias, which includes every current
+        standard name.
+        """
+        return self._aliases.get(name)
+
+    def rewrite(self, names):
+        """Return names with every alias replaced by its standard name.
+
+        Names that are not aliases, and aliases that do not resolve to
+        exactly one standard name, are returned unchanged.
+        """
+        aliases = self._aliases
+        result = []
+        for name in names:
+            targets = aliases.get(name)
+            result.append(targets[0] if targets and len(targets) == 1
+                          else name)
+        return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cfvocab.aliases',
+        description='Builds and queries the alias resolution index.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('build', help='index the aliases of every version')
+    p.add_argument('root', help='the cf-standard-names directory')
+    p.add_argument('output', help='index file')
+    p = sub.add_parser('resolve', help='resolve aliases with an index')
+    p.add_argument('index')
+    p.add_argument('names', nargs='+')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        n = build_index(args.root, args.output)
+        print('%s - indexed %d aliases' % (args.output, n))
+        return 0
+
+    index = AliasIndex(args.index)
+    for name in args.names:
+        targets = index.resolve(name)
+        if targets is None:
+            print('%s: not an alias' % name)
+        elif not targets:
+            print('%s: no standard name in version %s'
+                  % (name, index.version))
+        else:
+            print('%s: %s' % (name, ' '.join(targets)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""
+Links mentions of vocabulary terms in the descriptions of standard names.
+
+The terms are the standard names and aliases of a table, the area types of
+the area type table, the regions of the standardized region list and the
+phrase "area_type table". One Aho-Corasick automaton is built over all of
+them, so each description is scanned once, in time linear in its length and
+the number of mentions, however many terms there are.
+
+A mention is only linked if it is a whole term, not part of a longer name,
+and where mentions overlap the one that starts first, then the longest,
+wins. Terms of one word, such as "sea" or "height", are left out, since the
+descriptions mostly use them as ordinary words. Standard names link to
+their rows on the same page and aliases to the row of their entry; a
+description is not linked to its own row. Area types and regions link to
+their entries in the current version of their pages.
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import os
+import sys
+
+from .loader import AREA_TYPE_FILE, REGION_PREFIX, Alias, iter_entries, \
+    iter_table, iter_versions
+from .render import AREA_TYPE_TEXT, AREA_TYPE_URL, HTML_FILE, escape, \
+    escape_attribute, escape_uri, render
+
+REGION_URL = ('http://cfconventions.org/Data/standardized-region-list/'
+              'standardized-region-list.current.html')
+
+DATA = os.path.normpath(os.path.join(os.path.dirname(__file__), os.pardir,
+                                     os.pardir, 'Data'))
+AREA_TYPES = os.path.join(DATA, 'area-type-table', 'current', 'src',
+                          AREA_TYPE_FILE)
+REGIONS = os.path.join(DATA, 'standardized-region-list',
+                       REGION_PREFIX + 'current.xml')
+
+
+def _is_word(c):
+    return c.isalnum() or c == '_'
+
+
+def table_urls(source):
+    """Return the links of the standard names and aliases of a table file.
+
+    An alias links to the row of its entry, unless it has several.
+    """
+    urls = {}
+    aliases = {}
+    for record in iter_table(source):
+        if type(record) is Alias:
+            aliases.setdefault(record.id, set()).add(record.entry_id)
+        else:
+            urls[record.id] = '#' + escape_uri(record.id)
+    for name, entry_ids in aliases.items():
+        if len(entry_ids) == 1:
+            entry_id, = entry_ids
+            if entry_id in urls:
+                urls.setdefault(name, urls[entry_id])
+    return urls
+
+
+def vocabulary_urls(path, url):
+    """Return the links of the entries of an area type table or region list
+    to their anchors on the page at url."""
+    return dict((entry.id, '%s#%s' % (url, escape_uri(entry.id)))
+                for entry in iter_entries(path))
+
+
+def table_linker(source, area_types=AREA_TYPES, regions=REGIONS):
+    """Return the Linker of a table file.
+
+    Where a term is in several vocabularies, a standard name comes first,
+    then an area type, then a region.
+    """
+    urls = {AREA_TYPE_TEXT: AREA_TYPE_URL}
+    if regions:
+        urls.update(vocabulary_urls(regions, REGION_URL))
+    if area_types:
+        urls.update(vocabulary_urls(area_types, AREA_TYPE_URL))
+    urls.update(table_urls(source))
+    return Linker(dict((term, url) for term, url in urls.items()
+                       if '_' in term or ' ' in term))
+
+
+class Linker(object):
+    """Aho-Corasick automaton over terms, each with the URL it links to.
+
+    >>> linker = Linker({'sea_ice': '#sea_ice'})
+    >>> linker.link('Covered by sea_ice & snow.')
+    'Covered by <a href="#sea_ice">sea_ice</a> &amp; snow.'
+    """
+
+    def __init__(self, urls):
+        self.urls = urls
+        goto = [{}]
+        lengths = {}
+        for term in urls:
+            state = 0
+            for c in term:
+                following = goto[state].get(c)
+                if following is None:
+                    following = goto[state][c] = len(goto)
+                    goto.append({})
+                state = following
+            lengths[state] = len(term)
+
+        # The output of a state is the lengths of the terms that end there,
+        # longest first: its own, then those of its failure state.
+        fail = [0] * len(goto)
+        out = [()] * len(goto)
+        queue = collections.deque()
+        for state in goto[0].values():
+            if state in lengths:
+                out[state] = (lengths[state],)
+            queue.append(state)
+        while queue:
+            state = queue.popleft()
+            for c, following in goto[state].items():
+                f = fail[state]
+                while f and c not in goto[f]:
+                    f = fail[f]
+                f = goto[f].get(c, 0)
+                fail[following] = f
+                if following in lengths:
+                    out[following] = (lengths[following],) + out[f]
+                else:
+                    out[following] = out[f]
+                queue.append(following)
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def __len__(self):
+        return len(self.urls)
+
+    def find(self, text):
+        """Return the (start, end) of the mentions of terms in text.
+
+        Mentions are whole terms that do not overlap, leftmost and then
+        longest first.
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        n = len(text)
+        found = []
+        state = 0
+        for i, c in enumerate(text):
+            while state and c not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(c, 0)
+            if out[state] and (i + 1 == n or not _is_word(text[i + 1])):
+                for length in out[state]:
+                    start = i + 1 - length
+                    if start == 0 or not _is_word(text[start - 1]):
+                        found.append((start, i + 1))
+                        break
+        if len(found) < 2:
+            return found
+        found.sort(key=lambda span: (span[0], -span[1]))
+        mentions = []
+        last = 0
+        for start, end in found:
+            if start >= last:
+                mentions.append((start, end))
+                last = end
+        return mentions
+
+    def link(self, text, standard_name=None):
+        """Return text as HTML with the mentions of terms linked.
+
+        Mentions of standard_name, and of its aliases, are not linked.
+        """
+        own = self.urls.get(standard_name)
+        parts = []
+        pos = 0
+        for start, end in self.find(text):
+            url = self.urls[text[start:end]]
+            if url == own:
+                continue
+            parts.append(escape(text[pos:start]))
+            parts.append('<a href="%s">%s</a>'
+                         % (escape_attribute(url), escape(text[start:end])))
+            pos = end
+        parts.append(escape(text[pos:]))
+        return ''.join(parts)
+
+
+def render_linked(source, path, area_types=AREA_TYPES, regions=REGIONS):
+    """Render the page of a table file with its descriptions linked.
+
+    Returns the number of entries written.
+    """
+    return render(source, path, area_type_link=False,
+                  linker=table_linker(source, area_types, regions))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cfvocab.autolink',
+        description='Renders the HTML page of standard name tables with the '
+                    'mentions of standard names, area types and regions in '
+                    'their descriptions linked.')
+    parser.add_argument('source', help='table XML file, or the '
+                                       'cf-standard-names directory with --all')
+    parser.add_argument('output', nargs='?',
+                        help='HTML file (default: build/%s), or with --all '
+                             'the directory to write the pages to' % HTML_FILE)
+    parser.add_argument('--all', action='store_true',
+                        help='write <output>/<version>/%s for every version '
+                             'under source' % HTML_FILE)
+    parser.add_argument('--jobs', type=int,
+                        help='number of versions to render in parallel '
+                             '(default: one per CPU)')
+    parser.add_argument('--area-types', default=AREA_TYPES,
+                        help='area type table to link to (default: the '
+                             'current one)')
+    parser.add_argument('--regions', default=REGIONS,
+                        help='region list to link to (default: the current '
+                             'one)')
+    args = parser.parse_args(argv)
+
+    if args.all:
+        if not args.output:
+            parser.error('--all needs an output directory, such as '
+                         'build/pages, so that the published pages of the '
+                         'versions are not overwritten')
+        jobs = [(source, os.path.join(args.output, label, HTML_FILE))
+                for label, source in iter_versions(args.source)]
+    else:
+        jobs = [(args.source,
+                 args.output or os.path.join('build', HTML_FILE))]
+    for _, output in jobs:
+        os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with concurrent.futures.ProcessPoolExecutor(args.jobs) as pool:
+        futures = [pool.submit(render_linked, source, output, args.area_types,
+                               args.regions)
+                   for source, output in jobs]
+        for (_, output), future in zip(jobs, futures):
+            print('%s - rendered %d entries' % (output, future.result()))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
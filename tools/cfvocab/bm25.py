@@ -0,0 +1,158 @@
+"""
+Ranked full-text search over the descriptions of standard names.
+
+Descriptions are tokenized into lower-case runs of letters and digits, with
+no stemming, and indexed offline. Queries are ranked with Okapi BM25.
+
+The index is stored as gzipped JSON, by default in
+build/cf-standard-name-table.bm25.json.gz:
+
+    {"version": version_number, "names": [name, ...],
+     "lengths": [tokens in description, ...],
+     "terms": {term: [[first ordinal, gap, ...], [frequency, ...]], ...}}
+"""
+
+import argparse
+import gzip
+import heapq
+import itertools
+import json
+import math
+import os
+import re
+import sys
+
+from .fileutil import atomic_write
+from .loader import iter_entries, iter_versions, read_header
+
+INDEX_FILE = 'cf-standard-name-table.bm25.json.gz'
+
+K1 = 1.2
+B = 0.75
+
+_TOKEN = re.compile('[a-z0-9]+')
+
+
+def tokenize(text):
+    """Return the lower-case words of text."""
+    return _TOKEN.findall(text.lower())
+
+
+def build_index(source, path):
+    """Write the index of a table file to path. Returns the number of terms."""
+    names = []
+    lengths = []
+    terms = {}
+    for ordinal, entry in enumerate(iter_entries(source)):
+        tokens = tokenize(entry.description)
+        names.append(entry.id)
+        lengths.append(len(tokens))
+        counts = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+        for token, count in counts.items():
+            postings = terms.get(token)
+            if postings is None:
+                postings = terms[token] = [[], [], 0]
+            postings[0].append(ordinal - postings[2])
+            postings[1].append(count)
+            postings[2] = ordinal
+    index = {'version': read_header(source).get('version_number', ''),
+             'names': names,
+             'lengths': lengths,
+             'terms': dict((term, terms[term][:2]) for term in sorted(terms))}
+    with atomic_write(path) as raw:
+        with gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as f:
+            f.write(json.dumps(index, separators=(',', ':')).encode('utf-8'))
+    return len(terms)
+
+
+class BM25Index(object):
+    """Reader for an index written by build_index().
+
+    The BM25 weights of a term's postings are computed the first time the
+    term is searched for.
+    """
+
+    def __init__(self, path, k1=K1, b=B):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            index = json.load(f)
+        self.version = index['version']
+        self.names = index['names']
+        self._lengths = index['lengths']
+        self._terms = index['terms']
+        self._weights = {}
+        self.k1 = k1
+        self.b = b
+        self._average = (sum(self._lengths) / len(self._lengths)
+                         if self._lengths else 0.0)
+
+    def weights(self, term):
+        """Return the (ordinal, BM25 weight) pairs of a term."""
+        found = self._weights.get(term)
+        if found is None:
+            gaps, frequencies = self._terms.get(term, ((), ()))
+            n = len(self.names)
+            idf = math.log(1 + (n - len(gaps) + 0.5) / (len(gaps) + 0.5))
+            k1, b, average, lengths = self.k1, self.b, self._average, \
+                self._lengths
+            found = []
+            for ordinal, tf in zip(itertools.accumulate(gaps), frequencies):
+                norm = k1 * (1 - b + b * lengths[ordinal] / average)
+                found.append((ordinal, idf * tf * (k1 + 1) / (tf + norm)))
+            self._weights[term] = found
+        return found
+
+    def search(self, query, limit=10):
+        """Return up to limit (name, score) pairs, best first."""
+        scores = {}
+        for term in set(tokenize(query)):
+            for ordinal, weight in self.weights(term):
+                scores[ordinal] = scores.get(ordinal, 0.0) + weight
+        best = heapq.nlargest(limit, scores.items(),
+                              key=lambda item: (item[1], -item[0]))
+        return [(self.names[ordinal], score) for ordinal, score in best]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cfvocab.bm25',
+        description='Builds and searches the BM25 index of standard name '
+                    'descriptions.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('build', help='index a table, or every version')
+    p.add_argument('source', help='table XML file, or the cf-standard-names '
+                                  'directory with --all')
+    p.add_argument('output', nargs='?',
+                   default=os.path.join('build', INDEX_FILE),
+                   help='index file (default: build/%s)' % INDEX_FILE)
+    p.add_argument('--all', action='store_true',
+                   help='write <version>/build/%s for every version under '
+                        'source' % INDEX_FILE)
+    p = sub.add_parser('search', help='rank names by their descriptions')
+    p.add_argument('index')
+    p.add_argument('query')
+    p.add_argument('--limit', type=int, default=10,
+                   help='number of results (default: 10)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        if args.all:
+            jobs = [(source, os.path.join(args.source, label, 'build',
+                                          INDEX_FILE))
+                    for label, source in iter_versions(args.source)]
+        else:
+            jobs = [(args.source, args.output)]
+        for source, output in jobs:
+            os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+            n = build_index(source, output)
+            print('%s - indexed %d terms' % (output, n))
+        return 0
+
+    for name, score in BM25Index(args.index).search(args.query, args.limit):
+        print('%8.3f  %s' % (score, name))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
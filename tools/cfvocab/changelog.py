@@ -0,0 +1,181 @@
+"""
+Changelog of every release of the standard name table.
+
+Every version is compared with the one before it (1 to 2, ..., 77 to
+current) by diff.py. The versions are split into contiguous runs, one per
+process, and each process reads the tables of its run in order and compares
+each with the one before, so every table is parsed once. Only the first and
+last tables of a run are sent back, to compare it with the runs next to it.
+There is no version 38, so version 39 is compared with version 37.
+
+The directory written holds:
+
+    changelog.json  {"first": label, "releases": [{"old": label,
+                     "new": label, <the changes of diff.py>}, ...]}
+    changelog.html  the changes of every release, newest first
+    history.json    {name: [{"version": label, "change": kind, ...}, ...]}
+
+The history of a name lists, in release order, the versions in which it was
+added, removed or renamed, with "to" or "from" the other names, and in which
+its units, with "old" and "new", or its description changed.
+"""
+
+import argparse
+import concurrent.futures
+import json
+import os
+import sys
+
+from .diff import CHANGES, SUMMARY, diff_tables, read_table, summary, \
+    write_changes
+from .fileutil import atomic_write
+from .loader import iter_versions
+from .render import escape
+
+CHANGELOG_JSON = 'changelog.json'
+CHANGELOG_HTML = 'changelog.html'
+HISTORY_JSON = 'history.json'
+
+
+def _diff_run(sources):
+    """Read consecutive table files and compare each with the one before.
+
+    Returns (first table, changes, last table).
+    """
+    first = previous = read_table(sources[0])
+    changes = []
+    for source in sources[1:]:
+        table = read_table(source)
+        changes.append(diff_tables(previous, table))
+        previous = table
+    return first, changes, previous
+
+
+def compare_versions(root, jobs=None):
+    """Return (first label, first table, releases) for every version under
+    root, where releases are (old label, new label, changes) in order."""
+    versions = list(iter_versions(root))
+    sources = [source for _, source in versions]
+    n = len(sources)
+    k = min(jobs or os.cpu_count() or 1, n)
+    runs = [sources[i * n // k:(i + 1) * n // k] for i in range(k)]
+    changes = []
+    with concurrent.futures.ProcessPoolExecutor(k) as pool:
+        first = last = None
+        for run_first, run_changes, run_last in pool.map(_diff_run, runs):
+            if last is None:
+                first = run_first
+            else:
+                changes.append(diff_tables(last, run_first))
+            changes.extend(run_changes)
+            last = run_last
+    releases = [(versions[i][0], versions[i + 1][0], changes[i])
+                for i in range(n - 1)]
+    return versions[0][0], first, releases
+
+
+def name_history(first_label, first_table, releases):
+    """Return the history of every name, as written to history.json."""
+    history = dict((entry[0], [{'version': first_label, 'change': 'added'}])
+                   for entry in first_table[0])
+
+    def add(name, event):
+        history.setdefault(name, []).append(event)
+
+    for _, new, changes in releases:
+        renamed_from = {}
+        for item in changes['renamed']:
+            add(item['id'], {'version': new, 'change': 'renamed',
+                             'to': item['to']})
+            for name in item['to']:
+                renamed_from.setdefault(name, []).append(item['id'])
+        for name in sorted(renamed_from):
+            add(name, {'version': new, 'change': 'renamed',
+                       'from': renamed_from[name]})
+        for name in changes['added']:
+            add(name, {'version': new, 'change': 'added'})
+        for name in changes['removed']:
+            add(name, {'version': new, 'change': 'removed'})
+        for item in changes['units_changed']:
+            add(item['id'], {'version': new, 'change': 'units_changed',
+                             'old': item['old'], 'new': item['new']})
+        for item in changes['description_changed']:
+            add(item['id'], {'version': new, 'change': 'description_changed'})
+    return history
+
+
+def write_changelog_html(path, first_label, first_table, releases):
+    """Write the changes of every release to path as HTML."""
+    title = 'CF Standard Name Table Changelog'
+    with atomic_write(path, 'w', encoding='utf-8') as out:
+        out.write('<html>\n<head>\n<meta http-equiv="Content-Type" '
+                  'content="text/html; charset=UTF-8">\n<title>%s</title>\n'
+                  '<style>td { vertical-align: top; } '
+                  'th { text-align: left; }</style>\n</head>\n<body>\n'
+                  '<h1>%s</h1>\n<table>\n<tr><th>Version</th>'
+                  '<th>Previous</th>%s</tr>\n'
+                  % (title, title, ''.join('<th>%s</th>'
+                                           % escape(SUMMARY[key].capitalize())
+                                           for key in CHANGES)))
+        for old, new, changes in reversed(releases):
+            out.write('<tr><td><a href="#v%s">%s</a></td><td>%s</td>%s</tr>\n'
+                      % (escape(new), escape(new), escape(old),
+                         ''.join('<td>%d</td>' % len(changes[key])
+                                 for key in CHANGES)))
+        out.write('</table>\n')
+        for old, new, changes in reversed(releases):
+            out.write('<h2 id="v%s">Version %s</h2>\n'
+                      '<p>Changes from version %s: %s.</p>\n'
+                      % (escape(new), escape(new), escape(old),
+                         escape(summary(changes))))
+            write_changes(changes, out, 3, 'v%s-' % new)
+        out.write('<h2 id="v%s">Version %s</h2>\n'
+                  '<p>The first version, with %d standard names.</p>\n'
+                  '</body>\n</html>\n'
+                  % (escape(first_label), escape(first_label),
+                     len(first_table[0])))
+
+
+def build_changelog(root, directory, jobs=None):
+    """Write the changelog and name history of every version under root to
+    directory. Returns the number of releases."""
+    first_label, first_table, releases = compare_versions(root, jobs)
+    os.makedirs(directory, exist_ok=True)
+    with atomic_write(os.path.join(directory, CHANGELOG_JSON), 'w',
+                      encoding='utf-8') as f:
+        releases_json = []
+        for old, new, changes in releases:
+            release = {'old': old, 'new': new}
+            release.update(changes)
+            releases_json.append(release)
+        json.dump({'first': first_label, 'releases': releases_json}, f,
+                  indent=1, ensure_ascii=False)
+    write_changelog_html(os.path.join(directory, CHANGELOG_HTML),
+                         first_label, first_table, releases)
+    history = name_history(first_label, first_table, releases)
+    with atomic_write(os.path.join(directory, HISTORY_JSON), 'w',
+                      encoding='utf-8') as f:
+        json.dump(dict((name, history[name]) for name in sorted(history)), f,
+                  indent=0, separators=(',', ':'), ensure_ascii=False)
+    return len(releases)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cfvocab.changelog',
+        description='Writes the changelog of every release of the standard '
+                    'name table and the history of every name.')
+    parser.add_argument('root', help='the cf-standard-names directory')
+    parser.add_argument('output', nargs='?',
+                        default=os.path.join('build', 'changelog'),
+                        help='output directory (default: build/changelog)')
+    parser.add_argument('--jobs', type=int,
+                        help='number of processes (default: one per CPU)')
+    args = parser.parse_args(argv)
+    n = build_changelog(args.root, args.output, args.jobs)
+    print('%s - wrote the changes of %d releases' % (args.output, n))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Columnar export of every version of the vocabularies.
+
+Each vocabulary is written to one Parquet or Arrow IPC file with a row for
+every term of every version:
+
+    cf-standard-names         version, version_number, kind ("entry" or
+                              "alias"), id, entry_id, canonical_units, grib,
+                              amip, description
+    area-type-table           version, version_number, id, description
+    standardized-region-list  version, version_number, id, description
+
+version is the label of the version, such as "current", and version_number
+that in its header. Fields that are absent from a term are null. The
+columns that repeat across versions (version, kind, canonical_units, grib,
+amip and description) are dictionary encoded, so each distinct value is
+stored once. Arrow files can be memory-mapped by open_table().
+
+The export needs pyarrow, which is optional: the rest of the package only
+needs the standard library.
+"""
+
+import argparse
+import os
+import sys
+
+from .fileutil import atomic_write
+from .loader import VOCABULARIES, Alias, iter_sources, iter_table, \
+    read_header
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+COLUMNS = {
+    'cf-standard-names': ('version', 'version_number', 'kind', 'id',
+                          'entry_id', 'canonical_units', 'grib', 'amip',
+                          'description'),
+    'area-type-table': ('version', 'version_number', 'id', 'description'),
+    'standardized-region-list': ('version', 'version_number', 'id',
+                                 'description'),
+}
+DICTIONARY_COLUMNS = frozenset(('version', 'kind', 'canonical_units', 'grib',
+                                'amip', 'description'))
+
+
+def require_pyarrow():
+    """Raise ImportError with an explanation if pyarrow is missing."""
+    if pyarrow is None:
+        raise ImportError('the columnar export needs pyarrow; install it '
+                          'with "pip install pyarrow"')
+
+
+class _Dictionary(object):
+    """A dictionary-encoded string column, built value by value."""
+
+    def __init__(self):
+        self.indices = []
+        self._codes = {}
+
+    def append(self, value):
+        if value is None:
+            self.indices.append(None)
+            return
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._codes)
+        self.indices.append(code)
+
+    def array(self):
+        return pyarrow.DictionaryArray.from_arrays(
+            pyarrow.array(self.indices, pyarrow.int32()),
+            pyarrow.array(list(self._codes), pyarrow.string()))
+
+
+def _number(text):
+    return int(text) if text and text.isdigit() else None
+
+
+def _rows(path):
+    """Yield the (kind, id, entry_id, canonical_units, grib, amip,
+    description) of the terms of a vocabulary file."""
+    for record in iter_table(path, missing=None):
+        if type(record) is Alias:
+            yield 'alias', record.id, record.entry_id, None, None, None, None
+        else:
+            yield ('entry', record.id, None, record.canonical_units,
+                   record.grib, record.amip, record.description)
+
+
+def vocabulary_table(vocabulary, sources):
+    """Return the pyarrow Table of the (label, path) versions of a
+    vocabulary."""
+    require_pyarrow()
+    columns = COLUMNS[vocabulary]
+    values = dict((name, _Dictionary() if name in DICTIONARY_COLUMNS else [])
+                  for name in columns)
+    fields = COLUMNS['cf-standard-names'][2:]
+    for label, path in sources:
+        number = _number(read_header(path).get('version_number'))
+        for row in _rows(path):
+            values['version'].append(label)
+            values['version_number'].append(number)
+            for name, value in zip(fields, row):
+                if name in values:
+                    values[name].append(value)
+    types = {'version_number': pyarrow.int16()}
+    arrays = []
+    for name in columns:
+        column = values[name]
+        if name in DICTIONARY_COLUMNS:
+            arrays.append(column.array())
+        else:
+            arrays.append(pyarrow.array(column,
+                                        types.get(name, pyarrow.string())))
+    return pyarrow.Table.from_arrays(arrays, names=list(columns))
+
+
+def write_table(table, path, format='parquet'):
+    """Write a pyarrow Table to path as Parquet or as an Arrow IPC file."""
+    require_pyarrow()
+    with atomic_write(path) as f:
+        if format == 'parquet':
+            pyarrow.parquet.write_table(table, f)
+        else:
+            with pyarrow.ipc.new_file(f, table.schema) as writer:
+                writer.write_table(table)
+
+
+def open_table(path):
+    """Return the pyarrow Table of a file written by write_table().
+
+    Arrow files are memory-mapped rather than read.
+    """
+    require_pyarrow()
+    if path.endswith(FORMATS['arrow']):
+        return pyarrow.ipc.open_file(pyarrow.memory_map(path)).read_all()
+    return pyarrow.parquet.read_table(path, memory_map=True)
+
+
+def export(data, directory, format='parquet'):
+    """Write every version of each vocabulary under data to directory.
+
+    Returns the (path, rows) of the files written.
+    """
+    require_pyarrow()
+    sources = dict((vocabulary, []) for vocabulary in VOCABULARIES)
+    for vocabulary, label, path in iter_sources(data):
+        sources[vocabulary].append((label, path))
+    written = []
+    for vocabulary in VOCABULARIES:
+        table = vocabulary_table(vocabulary, sources[vocabulary])
+        path = os.path.join(directory, vocabulary + FORMATS[format])
+        write_table(table, path, format)
+        written.append((path, table.num_rows))
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cfvocab.columnar',
+        description='Exports every version of the vocabularies to columnar '
+                    'files, one row per version and term. Needs pyarrow.')
+    parser.add_argument('data', help='the Data directory of the web site')
+    parser.add_argument('output', nargs='?',
+                        default=os.path.join('build', 'columnar'),
+                        help='output directory (default: build/columnar)')
+    parser.add_argument('--format', choices=sorted(FORMATS),
+                        default='parquet',
+                        help='Parquet, or Arrow IPC files that can be '
+                             'memory-mapped (default: parquet)')
+    args = parser.parse_args(argv)
+    try:
+        require_pyarrow()
+    except ImportError as e:
+        parser.error(str(e))
+
+    os.makedirs(args.output, exist_ok=True)
+    for path, rows in export(args.data, args.output, args.format):
+        print('%s - wrote %d rows' % (path, rows))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,334 @@
+"""
+Compiled prefix trie for completing standard names and aliases.
+
+The trie holds the entry and alias ids of one table, folded to lower case,
+with the path of each chain of single children compressed into one node.
+Terms are numbered in rank order, standard names before aliases, then
+shorter before longer, then alphabetically, so the best completions of a
+prefix are the lowest numbers under its node. Each node stores the first K
+of them, and the range of its subtree in key order for longer lists. The
+file is opened with mmap, so loading it takes no parsing.
+
+File layout (all integers little-endian):
+
+    header   magic 'CFTR', format (H), K (H), node count (I),
+             term count (I), targets offset (I)
+    nodes    one 26 byte row per node, breadth first, so the children of a
+             node are contiguous and sorted by the first byte of their label:
+             label offset (I), label length (H), first child (I),
+             child count (H), subtree start (I), subtree end (I),
+             top offset (I), top count (H)
+    terms    one 10 byte row per term, in rank order:
+             id offset (I), id length (H), standard name term (I)
+    order    term numbers sorted by key (I each), indexed by subtree ranges
+    tops     term numbers (I each), referenced by the nodes
+    targets  for each alias of several entries, their count (I) and term
+             numbers (I each)
+    heap     UTF-8 strings referenced by the nodes and terms
+
+Node 0 is the root, labelled with the prefix common to every key. The
+standard name term of an entry is itself, and of an alias the entry it
+refers to. An alias of several entries, such as one that was split, has
+MANY plus the position of its entries in the targets, in units of four
+bytes, and an alias whose entries are not in the table has NO_TARGET.
+"""
+
+import argparse
+import collections
+import heapq
+import itertools
+import mmap
+import os
+import struct
+import sys
+
+from .fileutil import atomic_write
+from .loader import Alias, iter_table, iter_versions
+
+MAGIC = b'CFTR'
+FORMAT = 2
+HEADER = struct.Struct('<4sHHIII')
+NODE = struct.Struct('<IHIHIIIH')
+TERM = struct.Struct('<IHI')
+NO_TARGET = 0xFFFFFFFF
+MANY = 0x80000000
+TOP = 10
+
+TRIE_FILE = 'cf-standard-name-table.trie'
+
+
+class _Node(object):
+
+    __slots__ = ('label', 'children', 'start', 'end', 'terminals', 'top')
+
+    def __init__(self, label, start, end):
+        self.label = label
+        self.children = []
+        self.start = start
+        self.end = end
+        self.terminals = 0
+        self.top = []
+
+
+def _build(keys, start, end, depth, label_start):
+    """Return the node of keys[start:end], which share depth bytes."""
+    first, last = keys[start][0], keys[end - 1][0]
+    n = min(len(first), len(last))
+    while depth < n and first[depth] == last[depth]:
+        depth += 1
+    node = _Node(first[label_start:depth], start, end)
+    i = start
+    while i < end and len(keys[i][0]) == depth:
+        i += 1
+    node.terminals = i - start
+    while i < end:
+        byte = keys[i][0][depth]
+        j = i
+        while j < end and keys[j][0][depth] == byte:
+            j += 1
+        node.children.append(_build(keys, i, j, depth + 1, depth))
+        i = j
+    return node
+
+
+def compile_trie(source, path, top=TOP):
+    """Write the completion trie of the table file source to path."""
+    entries = set()
+    aliases = {}
+    for record in iter_table(source):
+        if type(record) is Alias:
+            aliases.setdefault(record.id, set()).add(record.entry_id)
+        else:
+            entries.add(record.id)
+    # An id that is both an entry and an alias is completed as the entry.
+    targets = dict((name, (name,)) for name in entries)
+    for name, entry_ids in aliases.items():
+        if name not in targets:
+            targets[name] = tuple(sorted(entry_ids & entries))
+    terms = sorted(targets, key=lambda name: (name not in entries,
+                                              len(name), name))
+    numbers = dict((name, i) for i, name in enumerate(terms))
+    many = []
+    term_targets = []
+    for name in terms:
+        names = targets[name]
+        if not names:
+            term_targets.append(NO_TARGET)
+        elif len(names) == 1:
+            term_targets.append(numbers[names[0]])
+        else:
+            term_targets.append(MANY | len(many))
+            many.append(len(names))
+            many.extend(numbers[target] for target in names)
+    keys = sorted((name.lower().encode('utf-8'), numbers[name])
+                  for name in terms)
+
+    root = _build(keys, 0, len(keys), 0, 0) if keys else _Node(b'', 0, 0)
+    nodes = []
+    queue = collections.deque([root])
+    while queue:
+        node = queue.popleft()
+        nodes.append(node)
+        queue.extend(node.children)
+    for node in reversed(nodes):
+        own = sorted(number for _, number in
+                     keys[node.start:node.start + node.terminals])
+        node.top = list(itertools.islice(
+            heapq.merge(own, *[child.top for child in node.children]), top))
+
+    heap = bytearray()
+    tops = []
+    node_rows = bytearray()
+    nodes_start = HEADER.size
+    terms_start = nodes_start + NODE.size * len(nodes)
+    order_start = terms_start + TERM.size * len(terms)
+    tops_start = order_start + 4 * len(keys)
+    many_start = tops_start + 4 * sum(len(node.top) for node in nodes)
+    heap_start = many_start + 4 * len(many)
+    child = 1
+    for node in nodes:
+        node_rows += NODE.pack(heap_start + len(heap), len(node.label),
+                               child, len(node.children), node.start,
+                               node.end, tops_start + 4 * len(tops),
+                               len(node.top))
+        heap += node.label
+        tops.extend(node.top)
+        child += len(node.children)
+    term_rows = bytearray()
+    for name, target in zip(terms, term_targets):
+        data = name.encode('utf-8')
+        term_rows += TERM.pack(heap_start + len(heap), len(data), target)
+        heap += data
+
+    with atomic_write(path) as f:
+        f.write(HEADER.pack(MAGIC, FORMAT, top, len(nodes), len(terms),
+                            many_start))
+        f.write(node_rows)
+        f.write(term_rows)
+        f.write(struct.pack('<%dI' % len(keys),
+                            *[number for _, number in keys]))
+        f.write(struct.pack('<%dI' % len(tops), *tops))
+        f.write(struct.pack('<%dI' % len(many), *many))
+        f.write(heap)
+    return len(terms)
+
+
+class Trie(object):
+    """Read-only view of a compiled trie file.
+
+    >>> trie = Trie('build/cf-standard-name-table.trie')
+    >>> trie.complete('air_temp', 2)
+    [('air_temperature', ('air_temperature',)), ...]
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, fmt, self.top, self._nodes, self._count, self._many = \
+            HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or fmt != FORMAT:
+            self._mm.close()
+            raise ValueError('%s is not a standard name trie' % path)
+        self._terms = HEADER.size + NODE.size * self._nodes
+        self._order = self._terms + TERM.size * self._count
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def _node(self, i):
+        return NODE.unpack_from(self._mm, HEADER.size + NODE.size * i)
+
+    def _find(self, key):
+        """Return the row of the node whose subtree has the keys starting
+        with key, or None."""
+        mm = self._mm
+        row = self._node(0)
+        depth = 0
+        while True:
+            label_off, label_len = row[0], row[1]
+            n = min(label_len, len(key) - depth)
+            if mm[label_off:label_off + n] != key[depth:depth + n]:
+                return None
+            depth += n
+            if depth == len(key):
+                return row
+            byte = key[depth]
+            lo, hi = row[2], row[2] + row[3]
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if mm[self._node(mid)[0]] < byte:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if lo == row[2] + row[3]:
+                return None
+            row = self._node(lo)
+            if mm[row[0]] != byte:
+                return None
+
+    def _name(self, number):
+        off, length, _ = TERM.unpack_from(self._mm,
+                                          self._terms + TERM.size * number)
+        return self._mm[off:off + length].decode('utf-8')
+
+    def _term(self, number):
+        off, length, target = TERM.unpack_from(
+            self._mm, self._terms + TERM.size * number)
+        name = self._mm[off:off + length].decode('utf-8')
+        if target == number:
+            return name, (name,)
+        if target == NO_TARGET:
+            return name, ()
+        if target & MANY:
+            at = self._many + 4 * (target & ~MANY)
+            count, = struct.unpack_from('<I', self._mm, at)
+            targets = struct.unpack_from('<%dI' % count, self._mm, at + 4)
+        else:
+            targets = (target,)
+        return name, tuple(self._name(target) for target in targets)
+
+    def complete(self, prefix, limit=TOP):
+        """Return the best limit completions of prefix, ignoring case.
+
+        Each is a (name, standard names) pair: an entry stands for itself,
+        and an alias for the entries it refers to that are in the table,
+        usually one, several if it was split, or none.
+        """
+        row = self._find(prefix.lower().encode('utf-8'))
+        if row is None:
+            return []
+        start, end, top_off, top_count = row[4:]
+        if limit <= top_count or top_count == end - start:
+            numbers = struct.unpack_from('<%dI' % min(limit, top_count),
+                                         self._mm, top_off)
+        else:
+            numbers = heapq.nsmallest(limit, struct.unpack_from(
+                '<%dI' % (end - start), self._mm, self._order + 4 * start))
+        return [self._term(number) for number in numbers]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cfvocab.complete',
+        description='Compiles completion tries of standard name tables and '
+                    'completes names with them.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('compile', help='compile a table, or every version')
+    p.add_argument('source', help='table XML file, or the cf-standard-names '
+                                  'directory with --all')
+    p.add_argument('output', nargs='?',
+                   default=os.path.join('build', TRIE_FILE),
+                   help='trie file (default: build/%s)' % TRIE_FILE)
+    p.add_argument('--all', action='store_true',
+                   help='write <version>/build/%s for every version under '
+                        'source' % TRIE_FILE)
+    p.add_argument('--top', type=int, default=TOP,
+                   help='completions stored for each prefix (default: %d)'
+                        % TOP)
+    p = sub.add_parser('complete', help='complete prefixes with a trie')
+    p.add_argument('trie')
+    p.add_argument('prefixes', nargs='+')
+    p.add_argument('--limit', type=int, default=TOP,
+                   help='number of completions (default: %d)' % TOP)
+    args = parser.parse_args(argv)
+
+    if args.command == 'compile':
+        if args.all:
+            jobs = [(source, os.path.join(args.source, label, 'build',
+                                          TRIE_FILE))
+                    for label, source in iter_versions(args.source)]
+        else:
+            jobs = [(args.source, args.output)]
+        for source, output in jobs:
+            os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+            n = compile_trie(source, output, args.top)
+            print('%s - compiled %d names' % (output, n))
+        return 0
+
+    with Trie(args.trie) as trie:
+        for prefix in args.prefixes:
+            for name, names in trie.complete(prefix, args.limit):
+                if names == (name,):
+                    print('%s: %s' % (prefix, name))
+                elif len(names) == 1:
+                    print('%s: %s (alias of %s)' % (prefix, name, names[0]))
+                elif names:
+                    print('%s: %s (ambiguous alias of %s)'
+                          % (prefix, name, ', '.join(names)))
+                else:
+                    print('%s: %s (alias of a missing standard name)'
+                          % (prefix, name))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""
+Delta-encoded chain of standard name table versions.
+
+The chain stores the first version in full and every later version as the
+changes from the version before it: entries added, modified and removed, and
+aliases added and removed. Every interval'th version is also stored in full
+as a checkpoint, so rebuilding a version applies at most interval - 1 deltas
+to the checkpoint before it.
+
+Entries are identified by id and aliases by (id, entry_id), since the same
+alias id may refer to more than one entry. A rebuilt version therefore has
+the content of the original table but not its document order: entries come
+first, sorted by id, followed by the aliases, sorted by id and entry_id.
+
+Chain layout:
+
+    chain.json          {"interval": K, "versions": [label, ...]}
+    <label>.json.gz     a checkpoint:
+                          {"version": label, "entries": [[id, canonical_units,
+                           grib, amip, description], ...],
+                           "aliases": [[id, entry_id], ...]}
+                        or a delta from the previous version:
+                          {"version": label, "base": previous label,
+                           "added": [entry, ...], "modified": [entry, ...],
+                           "removed": [id, ...], "aliases_added": [alias, ...],
+                           "aliases_removed": [alias, ...]}
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+
+from .fileutil import atomic_write
+from .loader import Alias, Entry, iter_table, iter_versions
+
+CHAIN_FILE = 'chain.json'
+DEFAULT_INTERVAL = 10
+
+_ENTRY_FIELDS = Entry.__slots__
+
+
+def _entry_row(entry):
+    return [getattr(entry, s) for s in _ENTRY_FIELDS]
+
+
+def read_state(source):
+    """Return (entries, aliases) for a table file.
+
+    entries maps id to the row [id, canonical_units, grib, amip, description]
+    and aliases is the set of (id, entry_id) pairs.
+    """
+    entries = {}
+    aliases = set()
+    for record in iter_table(source):
+        if type(record) is Alias:
+            aliases.add((record.id, record.entry_id))
+        else:
+            entries[record.id] = _entry_row(record)
+    return entries, aliases
+
+
+def make_delta(old, new):
+    """Return the delta that turns the state old into the state new."""
+    old_entries, old_aliases = old
+    new_entries, new_aliases = new
+    added = []
+    modified = []
+    for name in sorted(new_entries):
+        row = new_entries[name]
+        if name not in old_entries:
+            added.append(row)
+        elif old_entries[name] != row:
+            modified.append(row)
+    return {
+        'added': added,
+        'modified': modified,
+        'removed': sorted(name for name in old_entries
+                          if name not in new_entries),
+        'aliases_added': sorted(new_aliases - old_aliases),
+        'aliases_removed': sorted(old_aliases - new_aliases),
+    }
+
+
+def apply_delta(state, delta):
+    """Apply delta to state in place."""
+    entries, aliases = state
+    for name in delta['removed']:
+        del entries[name]
+    for row in delta['added']:
+        entries[row[0]] = row
+    for row in delta['modified']:
+        entries[row[0]] = row
+    for pair in delta['aliases_removed']:
+        aliases.discard(tuple(pair))
+    for pair in delta['aliases_added']:
+        aliases.add(tuple(pair))
+
+
+def _write_json_gz(path, obj):
+    with atomic_write(path) as raw:
+        with gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as f:
+            f.write(json.dumps(obj, ensure_ascii=False,
+                               separators=(',', ':')).encode('utf-8'))
+
+
+def build_chain(root, path, interval=DEFAULT_INTERVAL):
+    """Write the chain of every version under root to the directory path.
+
+    Only two versions are held in memory at a time. Returns the list of
+    version labels.
+    """
+    os.makedirs(path, exist_ok=True)
+    labels = []
+    previous = None
+    for label, source in iter_versions(root):
+        state = read_state(source)
+        if len(labels) % interval == 0:
+            record = {'version': label,
+                      'entries': [state[0][name] for name in sorted(state[0])],
+                      'aliases': sorted(state[1])}
+        else:
+            record = make_delta(previous, state)
+            record['version'] = label
+            record['base'] = labels[-1]
+        _write_json_gz(os.path.join(path, '%s.json.gz' % label), record)
+        labels.append(label)
+        previous = state
+
+    with atomic_write(os.path.join(path, CHAIN_FILE), 'w',
+                      encoding='utf-8') as f:
+        json.dump({'interval': interval, 'versions': labels}, f)
+    return labels
+
+
+class Chain(object):
+    """Lazily rebuilds versions from a chain written by build_chain().
+
+    The most recently rebuilt state is kept, so walking forwards through the
+    versions applies each delta only once.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, CHAIN_FILE), encoding='utf-8') as f:
+            chain = json.load(f)
+        self.interval = chain['interval']
+        self.versions = chain['versions']
+        self._position = dict((label, i)
+                              for i, label in enumerate(self.versions))
+        self._cached = None
+        self._state = None
+
+    def _read(self, i):
+        path = os.path.join(self.path, '%s.json.gz' % self.versions[i])
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
+
+    def state(self, label):
+        """Return (entries, aliases) of a version, as read_state() does.
+
+        The returned state is shared with the chain and must not be modified.
+        """
+        target = self._position[label]
+        checkpoint = target - target % self.interval
+        if self._cached is not None and checkpoint <= self._cached <= target:
+            start = self._cached + 1
+        else:
+            record = self._read(checkpoint)
+            self._state = (dict((row[0], row) for row in record['entries']),
+                           set(tuple(pair) for pair in record['aliases']))
+            start = checkpoint + 1
+        for i in range(start, target + 1):
+            apply_delta(self._state, self._read(i))
+        self._cached = target
+        return self._state
+
+    def load_version(self, label):
+        """Return the Entry and Alias records of a version."""
+        entries, aliases = self.state(label)
+        records = [Entry(*entries[name]) for name in sorted(entries)]
+        records.extend(Alias(*pair) for pair in sorted(aliases))
+        return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cfvocab.delta',
+        description='Builds a delta-encoded chain of every standard name '
+                    'table version.')
+    parser.add_argument('root', help='the cf-standard-names directory')
+    parser.add_argument('output', help='chain directory')
+    parser.add_argument('--interval', type=int, default=DEFAULT_INTERVAL,
+                        help='versions between checkpoints (default: %d)'
+                             % DEFAULT_INTERVAL)
+    args = parser.parse_args(argv)
+    labels = build_chain(args.root, args.output, args.interval)
+    print('%s - stored %d versions with a checkpoint every %d'
+          % (args.output, len(labels), args.interval))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,231 @@
+"""
+Differences between two versions of the standard name table.
+
+Each table is read once into its entries sorted by id and its aliases, and
+the two entry lists are compared in one sorted merge. The changes are:
+
+    added                entries only in the new version, except the new
+                         names of renamed entries
+    removed              entries only in the old version that the new
+                         version has no alias for
+    renamed              entries only in the old version whose id is an
+                         alias in the new one, with the entries it refers to
+    units_changed        entries whose canonical units changed
+    description_changed  entries whose description changed
+
+They are written as JSON,
+
+    {"old": label, "new": label, "added": [id, ...], "removed": [id, ...],
+     "renamed": [{"id": old id, "to": [id, ...]}, ...],
+     "units_changed": [{"id": id, "old": units, "new": units}, ...],
+     "description_changed": [{"id": id, "old": text, "new": text}, ...]}
+
+or as an HTML page, with every list sorted by id.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from .fileutil import atomic_write
+from .loader import TABLE_FILE, Alias, iter_table, read_header
+from .render import escape, escape_attribute
+
+CHANGES = ('added', 'removed', 'renamed', 'units_changed',
+           'description_changed')
+TITLES = {
+    'added': 'Added',
+    'removed': 'Removed',
+    'renamed': 'Renamed',
+    'units_changed': 'Canonical units changed',
+    'description_changed': 'Description changed',
+}
+SUMMARY = {
+    'added': 'added',
+    'removed': 'removed',
+    'renamed': 'renamed',
+    'units_changed': 'units changed',
+    'description_changed': 'descriptions changed',
+}
+
+
+def read_table(source):
+    """Return (entries, aliases) of a table file, for diff_tables().
+
+    entries is the list of (id, canonical_units, description) sorted by id,
+    and aliases maps each alias id to the sorted tuple of its entry ids.
+    Where an id is repeated, the last entry wins.
+    """
+    entries = {}
+    aliases = {}
+    for record in iter_table(source):
+        if type(record) is Alias:
+            aliases.setdefault(record.id, set()).add(record.entry_id)
+        else:
+            entries[record.id] = (record.id, record.canonical_units,
+                                  record.description)
+    return (sorted(entries.values()),
+            dict((name, tuple(sorted(ids))) for name, ids in aliases.items()))
+
+
+def diff_tables(old, new):
+    """Return the changes from one table to another as a dict of lists.
+
+    old and new are (entries, aliases) pairs from read_table(). The keys are
+    CHANGES, and the lists are sorted by id.
+    """
+    old_entries, _ = old
+    new_entries, new_aliases = new
+    added = []
+    removed = []
+    units_changed = []
+    description_changed = []
+    i = j = 0
+    while i < len(old_entries) and j < len(new_entries):
+        a = old_entries[i]
+        b = new_entries[j]
+        if a[0] < b[0]:
+            removed.append(a[0])
+            i += 1
+        elif a[0] > b[0]:
+            added.append(b[0])
+            j += 1
+        else:
+            if a[1] != b[1]:
+                units_changed.append({'id': a[0], 'old': a[1], 'new': b[1]})
+            if a[2] != b[2]:
+                description_changed.append({'id': a[0], 'old': a[2],
+                                            'new': b[2]})
+            i += 1
+            j += 1
+    removed.extend(entry[0] for entry in old_entries[i:])
+    added.extend(entry[0] for entry in new_entries[j:])
+
+    renamed = []
+    gone = []
+    targets = set()
+    for name in removed:
+        to = new_aliases.get(name)
+        if to:
+            renamed.append({'id': name, 'to': list(to)})
+            targets.update(to)
+        else:
+            gone.append(name)
+    return {
+        'added': [name for name in added if name not in targets],
+        'removed': gone,
+        'renamed': renamed,
+        'units_changed': units_changed,
+        'description_changed': description_changed,
+    }
+
+
+def summary(changes):
+    """Return a one-line count of the changes."""
+    return ', '.join('%d %s' % (len(changes[key]), SUMMARY[key])
+                     for key in CHANGES)
+
+
+def write_json(path, old, new, changes):
+    """Write the changes from version old to version new to path as JSON."""
+    report = {'old': old, 'new': new}
+    report.update(changes)
+    with atomic_write(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=1, ensure_ascii=False)
+
+
+def write_changes(changes, out, level=2, anchor=''):
+    """Write the changes as HTML sections with headings of the given level.
+
+    Headings have ids made of anchor and the kind of change.
+    """
+    for key in CHANGES:
+        items = changes[key]
+        if not items:
+            continue
+        out.write('<h%d id="%s%s">%s (%d)</h%d>\n'
+                  % (level, escape_attribute(anchor), key, TITLES[key],
+                     len(items), level))
+        if key in ('added', 'removed'):
+            out.write('<ul>\n')
+            for name in items:
+                out.write('<li><code>%s</code></li>\n' % escape(name))
+            out.write('</ul>\n')
+        elif key == 'renamed':
+            out.write('<ul>\n')
+            for item in items:
+                out.write('<li><code>%s</code> to %s</li>\n'
+                          % (escape(item['id']),
+                             ', '.join('<code>%s</code>' % escape(name)
+                                       for name in item['to'])))
+            out.write('</ul>\n')
+        else:
+            out.write('<table>\n<tr><th>Standard name</th><th>Old</th>'
+                      '<th>New</th></tr>\n')
+            for item in items:
+                out.write('<tr><td><code>%s</code></td><td>%s</td>'
+                          '<td>%s</td></tr>\n'
+                          % (escape(item['id']), escape(item['old'] or ''),
+                             escape(item['new'] or '')))
+            out.write('</table>\n')
+
+
+def write_html(path, old, new, changes):
+    """Write the changes from version old to version new to path as HTML."""
+    title = ('Changes to the CF Standard Name Table from version %s to %s'
+             % (old, new))
+    with atomic_write(path, 'w', encoding='utf-8') as out:
+        out.write('<html>\n<head>\n<meta http-equiv="Content-Type" '
+                  'content="text/html; charset=UTF-8">\n<title>%s</title>\n'
+                  '<style>td { vertical-align: top; } '
+                  'th { text-align: left; }</style>\n</head>\n<body>\n'
+                  '<h1>%s</h1>\n<p>%s</p>\n'
+                  % (escape(title), escape(title), escape(summary(changes))))
+        write_changes(changes, out)
+        out.write('</body>\n</html>\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cfvocab.diff',
+        description='Compares two versions of the standard name table.')
+    parser.add_argument('old', help='table XML file, or version label with '
+                                    '--root')
+    parser.add_argument('new', help='table XML file, or version label with '
+                                    '--root')
+    parser.add_argument('--root',
+                        help='the cf-standard-names directory, to give the '
+                             'versions by label')
+    parser.add_argument('--json', help='write the changes to this JSON file')
+    parser.add_argument('--html', help='write the changes to this HTML file')
+    args = parser.parse_args(argv)
+
+    versions = []
+    for version in (args.old, args.new):
+        if args.root:
+            source = os.path.join(args.root, version, 'src', TABLE_FILE)
+            if not os.path.isfile(source):
+                parser.error('there is no version %s in %s'
+                             % (version, args.root))
+            label = version
+        else:
+            source = version
+            if not os.path.isfile(source):
+                parser.error('%s does not exist' % source)
+            label = read_header(source).get('version_number') or source
+        versions.append((label, read_table(source)))
+    (old, old_table), (new, new_table) = versions
+    changes = diff_tables(old_table, new_table)
+    print('%s -> %s: %s' % (old, new, summary(changes)))
+    if args.json:
+        write_json(args.json, old, new, changes)
+        print('%s - wrote changes' % args.json)
+    if args.html:
+        write_html(args.html, old, new, changes)
+        print('%s - wrote changes' % args.html)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,42 @@
+"""
+Small file helpers shared by the cfvocab tools.
+"""
+
+import contextlib
+import os
+import tempfile
+
+
+@contextlib.contextmanager
+def atomic_path(path):
+    """Yield the name of a new temporary file next to path, and move it over
+    path on success.
+
+    For writers that open the file by name, such as sqlite3. The temporary
+    file is removed if the block fails.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tempname = tempfile.mkstemp(dir=directory,
+                                    prefix='.%s.' % os.path.basename(path))
+    os.close(fd)
+    try:
+        # mkstemp creates the file private to the user; build output is not.
+        os.chmod(tempname, 0o644)
+        yield tempname
+        os.replace(tempname, path)
+    except BaseException:
+        if os.path.exists(tempname):
+            os.unlink(tempname)
+        raise
+
+
+@contextlib.contextmanager
+def atomic_write(path, mode='wb', encoding=None):
+    """Open a temporary file next to path and move it over path on success.
+
+    Readers never see a partially written file, and a reader that already
+    has the old file open (or mmap'd) keeps its copy.
+    """
+    with atomic_path(path) as tempname:
+        with open(tempname, mode, encoding=encoding) as f:
+            yield f
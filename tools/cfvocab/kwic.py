@@ -0,0 +1,106 @@
+"""
+Keyword-in-context (KWIC) index of the standard names.
+
+Every standard name is split into its underscore-separated words, and each
+word, except for a few connecting words, becomes a keyword under which the
+name is listed with the words before and after it as context. The
+(keyword, name) pairs are sorted in one pass and grouped by keyword, and
+the index is written straight to build/kwic_index_for_cf_standard_names.html
+with links into cf-standard-name-table.html.
+"""
+
+import argparse
+import itertools
+import os
+import sys
+
+from .fileutil import atomic_write
+from .loader import iter_entries, read_header
+from .render import escape, escape_attribute, escape_uri
+
+KWIC_FILE = 'kwic_index_for_cf_standard_names.html'
+TABLE_PAGE = 'cf-standard-name-table.html'
+
+STOP_WORDS = frozenset(('a', 'and', 'as', 'at', 'by', 'for', 'from', 'in',
+                        'into', 'of', 'on', 'or', 'the', 'to', 'with'))
+
+
+def kwic_pairs(names, stop_words=STOP_WORDS):
+    """Return the sorted (keyword, name, position) triples of names."""
+    pairs = []
+    for name in names:
+        words = name.split('_')
+        for position, word in enumerate(words):
+            if word and word not in stop_words:
+                pairs.append((word, name, position))
+    pairs.sort()
+    return pairs
+
+
+def write_index(pairs, out, version=''):
+    """Write the KWIC index page of sorted triples to the file out."""
+    groups = [(keyword, list(group)) for keyword, group
+              in itertools.groupby(pairs, key=lambda pair: pair[0])]
+    out.write('<html>\n<head>\n<meta http-equiv="Content-Type" '
+              'content="text/html; charset=UTF-8">\n'
+              '<title>KWIC Index for CF Standard Names</title>\n'
+              '<style>td.left { text-align: right; white-space: nowrap; } '
+              'td.keyword { font-weight: bold; }</style>\n</head>\n<body>\n'
+              '<h1>KWIC Index for CF Standard Names</h1>\n')
+    if version:
+        out.write('<b>Version %s</b><br><br>\n' % escape(version))
+    out.write('<p>')
+    out.write(' \n'.join('<a href="#kw_%s">%s</a>'
+                         % (escape_attribute(keyword), escape(keyword))
+                         for keyword, _ in groups))
+    out.write('</p>\n')
+    for keyword, group in groups:
+        out.write('<h2 id="kw_%s">%s</h2>\n<table>\n'
+                  % (escape_attribute(keyword), escape(keyword)))
+        for _, name, position in group:
+            words = name.split('_')
+            left = '_'.join(words[:position])
+            right = '_'.join(words[position + 1:])
+            out.write('<tr><td class="left">%s</td>'
+                      '<td class="keyword"><a href="%s#%s">%s</a></td>'
+                      '<td>%s</td></tr>\n'
+                      % (escape(left + '_' if left else ''), TABLE_PAGE,
+                         escape_uri(name), escape(keyword),
+                         escape('_' + right if right else '')))
+        out.write('</table>\n')
+    out.write('</body>\n</html>\n')
+    return len(groups)
+
+
+def build_kwic(source, path, stop_words=STOP_WORDS):
+    """Write the KWIC index page of a table file to path.
+
+    Returns the number of keywords.
+    """
+    pairs = kwic_pairs((entry.id for entry in iter_entries(source)),
+                       stop_words)
+    version = read_header(source).get('version_number', '')
+    with atomic_write(path, 'w', encoding='utf-8') as out:
+        return write_index(pairs, out, version)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cfvocab.kwic',
+        description='Writes the KWIC index page of a standard name table.')
+    parser.add_argument('source', help='table XML file')
+    parser.add_argument('output', nargs='?',
+                        default=os.path.join('build', KWIC_FILE),
+                        help='HTML file (default: build/%s)' % KWIC_FILE)
+    parser.add_argument('--all-words', action='store_true',
+                        help='also index connecting words such as "of" '
+                             'and "in"')
+    args = parser.parse_args(argv)
+    n = build_kwic(args.source, args.output,
+                   frozenset() if args.all_words else STOP_WORDS)
+    print('%s - indexed %d keywords' % (args.output, n))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Help text of the standard name table page, loaded when it is first shown.
+
+Every row of the page carries its description in a hidden _help div, which
+makes up most of the page. render.py --lazy-help leaves the divs out, and
+the help of all entries is written once to build/help/help.json, a JSON
+list of the innerHTML of the divs indexed by entry ordinal. help.js, which
+the page includes, fetches it on the first toggleHelp or showHelp, or on a
+search of the help text, and creates the divs that are needed.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from .fileutil import atomic_write
+from .loader import iter_versions
+from .webfilter import copy_scripts, table_helps
+
+HELP_DIR = 'help'
+HELP_FILE = 'help.json'
+HELP_SCRIPTS = (('cf-standard-name-help.js', 'help.js'),)
+
+
+def build_help(source, directory):
+    """Write the help of a table file and help.js to directory.
+
+    Returns the number of entries.
+    """
+    _, helps = table_helps(source)
+    os.makedirs(directory, exist_ok=True)
+    with atomic_write(os.path.join(directory, HELP_FILE), 'w',
+                      encoding='utf-8') as f:
+        json.dump(helps, f, ensure_ascii=False, separators=(',', ':'))
+    copy_scripts(directory, HELP_SCRIPTS)
+    return len(helps)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cfvocab.lazyhelp',
+        description='Writes the help of a standard name table, to be loaded '
+                    'by its page when it is first shown.')
+    parser.add_argument('source', help='table XML file, or the '
+                                       'cf-standard-names directory with --all')
+    parser.add_argument('output', nargs='?',
+                        default=os.path.join('build', HELP_DIR),
+                        help='help directory (default: build/%s)' % HELP_DIR)
+    parser.add_argument('--all', action='store_true',
+                        help='write <version>/build/%s/ for every version '
+                             'under source' % HELP_DIR)
+    args = parser.parse_args(argv)
+
+    if args.all:
+        jobs = [(source, os.path.join(args.source, label, 'build', HELP_DIR))
+                for label, source in iter_versions(args.source)]
+    else:
+        jobs = [(args.source, args.output)]
+    for source, output in jobs:
+        n = build_help(source, output)
+        print('%s - wrote the help of %d entries' % (output, n))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,286 @@
+"""
+Lifecycle of every standard name and alias across table versions.
+
+For every id ever published, the index holds bitsets of version numbers,
+Python ints in which bit N stands for version N: the versions in which it
+was an entry, in which it was an alias, and in which its canonical units or
+its description differed from the last version it was an entry in. The
+current table has the number in its version_number, so "current" is the
+same bit as the latest numbered version. Questions such as "was X valid in
+version N", "what is the first version of X" or "which names are valid in
+every version from 40 to 77" are then a few bitwise operations.
+
+The index is stored as JSON, with the bitsets in hexadecimal:
+
+    {"versions": [1, 2, ...], "labels": {"current": 77},
+     "names": {id: [entries, aliases, units, description], ...}}
+
+With NumPy installed, Lifecycle.matrix() returns the names by versions
+matrix of booleans.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from .diff import read_table
+from .fileutil import atomic_write
+from .loader import iter_versions, read_header
+
+LIFECYCLE_FILE = 'lifecycle.json'
+
+
+def version_number(label, source):
+    """Return the number of a version from its label or its header."""
+    if label.isdigit():
+        return int(label)
+    return int(read_header(source)['version_number'])
+
+
+def build_index(root, path):
+    """Write the lifecycle index of every version under root to path.
+
+    Returns the number of ids.
+    """
+    names = {}
+    labels = {}
+    numbers = set()
+    last = {}
+    for label, source in iter_versions(root):
+        number = version_number(label, source)
+        if not label.isdigit():
+            labels[label] = number
+        numbers.add(number)
+        bit = 1 << number
+        entries, aliases = read_table(source)
+        for name, units, description in entries:
+            row = names.setdefault(name, [0, 0, 0, 0])
+            row[0] |= bit
+            before = last.get(name)
+            if before is not None and before[0] != number:
+                if before[1] != units:
+                    row[2] |= bit
+                if before[2] != description:
+                    row[3] |= bit
+            last[name] = (number, units, description)
+        for name in aliases:
+            names.setdefault(name, [0, 0, 0, 0])[1] |= bit
+    with atomic_write(path, 'w', encoding='utf-8') as f:
+        json.dump({'versions': sorted(numbers), 'labels': labels,
+                   'names': dict((name, ['%x' % bits for bits in names[name]])
+                                 for name in sorted(names))},
+                  f, indent=0, separators=(',', ':'))
+    return len(names)
+
+
+def _bits(bits):
+    """Return the numbers of the bits set in bits, lowest first."""
+    found = []
+    while bits:
+        low = bits & -bits
+        found.append(low.bit_length() - 1)
+        bits ^= low
+    return found
+
+
+class Lifecycle(object):
+    """Version bitsets of every name from an index written by build_index().
+
+    Versions are numbers or labels such as "current".
+    """
+
+    def __init__(self, path):
+        with open(path, encoding='utf-8') as f:
+            index = json.load(f)
+        self.versions = index['versions']
+        self.labels = index['labels']
+        self._names = dict((name, tuple(int(bits, 16) for bits in row))
+                           for name, row in index['names'].items())
+        self.all = sum(1 << number for number in self.versions)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def number(self, version):
+        """Return the number of a version given by number or label."""
+        if isinstance(version, int):
+            return version
+        if version.isdigit():
+            return int(version)
+        try:
+            return self.labels[version]
+        except KeyError:
+            raise ValueError('unknown version %r' % version)
+
+    def mask(self, first=None, last=None):
+        """Return the bitset of the versions from first to last."""
+        low = 0 if first is None else self.number(first)
+        high = max(self.versions) if last is None else self.number(last)
+        return self.all & ((1 << high + 1) - (1 << low))
+
+    def valid_bits(self, name):
+        """Return the versions in which name is an entry or an alias."""
+        row = self._names.get(name)
+        return row[0] | row[1] if row else 0
+
+    def entry_bits(self, name):
+        """Return the versions in which name is an entry."""
+        row = self._names.get(name)
+        return row[0] if row else 0
+
+    def alias_bits(self, name):
+        """Return the versions in which name is an alias."""
+        row = self._names.get(name)
+        return row[1] if row else 0
+
+    def units_changed(self, name):
+        """Return the numbers of the versions that changed the units."""
+        row = self._names.get(name)
+        return _bits(row[2]) if row else []
+
+    def description_changed(self, name):
+        """Return the numbers of the versions that changed the description."""
+        row = self._names.get(name)
+        return _bits(row[3]) if row else []
+
+    def is_valid(self, name, version):
+        """Return True if name is an entry or alias of the version."""
+        return bool(self.valid_bits(name) >> self.number(version) & 1)
+
+    def first(self, name):
+        """Return the number of the first version of name, or None."""
+        bits = self.valid_bits(name)
+        return (bits & -bits).bit_length() - 1 if bits else None
+
+    def last(self, name):
+        """Return the number of the last version of name, or None."""
+        bits = self.valid_bits(name)
+        return bits.bit_length() - 1 if bits else None
+
+    def valid_versions(self, name):
+        """Return the numbers of the versions in which name is valid."""
+        return _bits(self.valid_bits(name))
+
+    def valid_in_all(self, first=None, last=None, entries=False):
+        """Return the names valid in every version from first to last.
+
+        With entries, only names that are entries in every one of them.
+        """
+        mask = self.mask(first, last)
+        if not mask:
+            raise ValueError('no versions from %s to %s' % (first, last))
+        found = []
+        for name, row in self._names.items():
+            bits = row[0] if entries else row[0] | row[1]
+            if bits & mask == mask:
+                found.append(name)
+        return sorted(found)
+
+    def valid_in(self, version, entries=False):
+        """Return the names valid in a version."""
+        return self.valid_in_all(version, version, entries)
+
+    def matrix(self, names=None):
+        """Return (names, versions, matrix) with NumPy.
+
+        matrix[i, j] is True if names[i] is valid in versions[j]. names
+        defaults to every name, sorted.
+        """
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError('Lifecycle.matrix() needs NumPy, which is not '
+                              'installed')
+        names = sorted(self._names) if names is None else list(names)
+        width = max(self.versions) // 8 + 1
+        data = b''.join(self.valid_bits(name).to_bytes(width, 'little')
+                        for name in names)
+        bits = numpy.unpackbits(
+            numpy.frombuffer(data, dtype=numpy.uint8).reshape(len(names),
+                                                              width),
+            axis=1, bitorder='little')
+        return names, list(self.versions), bits[:, self.versions] == 1
+
+    def format_versions(self, numbers):
+        """Return numbers as ranges of consecutive published versions."""
+        positions = dict((number, i) for i, number in enumerate(self.versions))
+        ranges = []
+        for number in numbers:
+            if ranges and positions[number] == positions[ranges[-1][1]] + 1:
+                ranges[-1][1] = number
+            else:
+                ranges.append([number, number])
+        return ', '.join(str(a) if a == b else '%d-%d' % (a, b)
+                         for a, b in ranges) or '-'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cfvocab.lifecycle',
+        description='Builds and queries the versions in which every standard '
+                    'name and alias was published.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('build', help='index every version')
+    p.add_argument('root', help='the cf-standard-names directory')
+    p.add_argument('output', nargs='?',
+                   default=os.path.join('build', LIFECYCLE_FILE),
+                   help='index file (default: build/%s)' % LIFECYCLE_FILE)
+    p = sub.add_parser('show', help='print the lifecycle of names, or '
+                                    'whether they are valid in a version')
+    p.add_argument('index')
+    p.add_argument('names', nargs='+')
+    p.add_argument('--version', help='version number or label to check')
+    p = sub.add_parser('valid', help='print the names valid in every '
+                                     'version from first to last')
+    p.add_argument('index')
+    p.add_argument('first', help='version number or label')
+    p.add_argument('last', nargs='?', help='version number or label '
+                                           '(default: first)')
+    p.add_argument('--entries', action='store_true',
+                   help='only names that are entries, not aliases')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        n = build_index(args.root, args.output)
+        print('%s - indexed %d names' % (args.output, n))
+        return 0
+
+    lifecycle = Lifecycle(args.index)
+    try:
+        if args.command == 'valid':
+            for name in lifecycle.valid_in_all(args.first,
+                                               args.last or args.first,
+                                               args.entries):
+                print(name)
+            return 0
+        for name in args.names:
+            if name not in lifecycle:
+                print('%s: never published' % name)
+            elif args.version:
+                print('%s: %s in version %s' % (
+                    name, 'valid' if lifecycle.is_valid(name, args.version)
+                    else 'not valid', args.version))
+            else:
+                print('%s: entry in %s; alias in %s; units changed in %s; '
+                      'description changed in %s' % (
+                          name,
+                          lifecycle.format_versions(
+                              _bits(lifecycle.entry_bits(name))),
+                          lifecycle.format_versions(
+                              _bits(lifecycle.alias_bits(name))),
+                          lifecycle.format_versions(
+                              lifecycle.units_changed(name)),
+                          lifecycle.format_versions(
+                              lifecycle.description_changed(name))))
+    except ValueError as e:
+        parser.error(str(e))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
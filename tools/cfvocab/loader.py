@@ -0,0 +1,192 @@
+"""
+Streaming reader for cf-standard-name-table.xml.
+
+The table is parsed incrementally and each <entry> or <alias> element is
+cleared as soon as it has been turned into a record, so that only one
+element is held in memory at a time regardless of the size of the table.
+
+The area type table and the standardized region list have the same <entry>
+structure, with only a description, and can be read the same way.
+"""
+
+import os
+import sys
+from xml.etree import ElementTree
+
+TABLE_FILE = 'cf-standard-name-table.xml'
+AREA_TYPE_FILE = 'area-type-table.xml'
+REGION_PREFIX = 'standardized-region-list.'
+
+VOCABULARIES = ('cf-standard-names', 'area-type-table',
+                'standardized-region-list')
+
+
+class Entry(object):
+    """A standard name and its canonical units, GRIB/AMIP codes and description."""
+
+    __slots__ = ('id', 'canonical_units', 'grib', 'amip', 'description')
+
+    def __init__(self, id, canonical_units='', grib='', amip='', description=''):
+        self.id = id
+        self.canonical_units = canonical_units
+        self.grib = grib
+        self.amip = amip
+        self.description = description
+
+    def __repr__(self):
+        return 'Entry(%r, %r)' % (self.id, self.canonical_units)
+
+
+class Alias(object):
+    """An alias id that refers to the standard name entry_id."""
+
+    __slots__ = ('id', 'entry_id')
+
+    def __init__(self, id, entry_id):
+        self.id = id
+        self.entry_id = entry_id
+
+    def __repr__(self):
+        return 'Alias(%r, %r)' % (self.id, self.entry_id)
+
+
+def _text(elem, tag, missing=''):
+    child = elem.find(tag)
+    if child is None:
+        return missing
+    return child.text or ''
+
+
+def iter_table(source, missing=''):
+    """Yield Entry and Alias records from a table file in document order.
+
+    source may be a path or a binary file object. Fields whose element is
+    absent from an entry are set to missing; empty elements give ''.
+    """
+    context = ElementTree.iterparse(source, events=('start', 'end'))
+    _, root = next(context)
+    for event, elem in context:
+        if event != 'end':
+            continue
+        if elem.tag == 'entry':
+            yield Entry(elem.get('id'),
+                        _text(elem, 'canonical_units', missing),
+                        _text(elem, 'grib', missing),
+                        _text(elem, 'amip', missing),
+                        _text(elem, 'description', missing))
+            root.clear()
+        elif elem.tag == 'alias':
+            yield Alias(elem.get('id'), _text(elem, 'entry_id', missing))
+            root.clear()
+
+
+def read_header(source):
+    """Return a dict of the elements that come before the first entry.
+
+    This is version_number, last_modified, institution and contact for a
+    standard name table. Only the header is read, not the rest of the file.
+    """
+    header = {}
+    depth = 0
+    for event, elem in ElementTree.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            depth += 1
+            if depth == 2 and elem.tag in ('entry', 'alias'):
+                break
+        else:
+            depth -= 1
+            if depth == 1:
+                header[elem.tag] = (elem.text or '').strip()
+    return header
+
+
+def iter_entries(source):
+    """Yield only the Entry records of a table file."""
+    for record in iter_table(source):
+        if type(record) is Entry:
+            yield record
+
+
+def iter_aliases(source):
+    """Yield only the Alias records of a table file."""
+    for record in iter_table(source):
+        if type(record) is Alias:
+            yield record
+
+
+def version_key(label):
+    # Numbered versions in numeric order, with 'current' after all of them.
+    if label.isdigit():
+        return (0, int(label))
+    return (1, label)
+
+
+def iter_versions(root):
+    """Yield (label, path) for every version table under root.
+
+    root is a directory laid out like Data/cf-standard-names, i.e. with one
+    <label>/src/cf-standard-name-table.xml per version. Labels are returned
+    in release order; gaps in the numbering (there is no version 38) are
+    simply skipped.
+    """
+    return _iter_version_dirs(root, TABLE_FILE)
+
+
+def _iter_version_dirs(root, filename):
+    labels = [label for label in os.listdir(root)
+              if os.path.isfile(os.path.join(root, label, 'src', filename))]
+    for label in sorted(labels, key=version_key):
+        yield label, os.path.join(root, label, 'src', filename)
+
+
+def iter_region_lists(root):
+    """Yield (label, path) for every standardized region list under root.
+
+    The lists are files named standardized-region-list.<label>.xml. The
+    unversioned standardized-region-list.xml is a copy of the current list
+    and is skipped.
+    """
+    labels = [name[len(REGION_PREFIX):-len('.xml')]
+              for name in os.listdir(root)
+              if name.startswith(REGION_PREFIX) and name.endswith('.xml')
+              and name.count('.') == 2]
+    for label in sorted(labels, key=version_key):
+        yield label, os.path.join(root, '%s%s.xml' % (REGION_PREFIX, label))
+
+
+def iter_sources(data):
+    """Yield (vocabulary, label, path) for every version of every vocabulary.
+
+    data is the Data directory of the web site.
+    """
+    for vocabulary in VOCABULARIES:
+        root = os.path.join(data, vocabulary)
+        if vocabulary == 'cf-standard-names':
+            versions = _iter_version_dirs(root, TABLE_FILE)
+        elif vocabulary == 'area-type-table':
+            versions = _iter_version_dirs(root, AREA_TYPE_FILE)
+        else:
+            versions = iter_region_lists(root)
+        for label, path in versions:
+            yield vocabulary, label, path
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print('%s - Counts entries and aliases in standard name tables.\n'
+              'Usage:  python -m cfvocab.loader <file> [<file> ...]' % __name__)
+        return 1
+    for path in argv:
+        entries = aliases = 0
+        for record in iter_table(path):
+            if type(record) is Entry:
+                entries += 1
+            else:
+                aliases += 1
+        print('%s: %d entries, %d aliases' % (path, entries, aliases))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
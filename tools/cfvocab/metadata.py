@@ -0,0 +1,85 @@
+"""
+Header metadata of vocabulary files, and a catalog of every version.
+
+Only the header of each file, the elements before the first <entry>, is
+read: title, version_number, date (last_modified in the standard name
+table) and institution. The catalog sweeps every version of the standard
+name table, the area type table and the standardized region list in
+parallel and writes them to one JSON file.
+"""
+
+import argparse
+import concurrent.futures
+import json
+import os
+import sys
+
+from .fileutil import atomic_write
+from .loader import iter_sources, read_header
+
+FIELDS = ('title', 'version_number', 'date', 'institution')
+
+
+def read_metadata(path):
+    """Return the title, version_number, date and institution of a file.
+
+    Fields missing from the header are None.
+    """
+    header = read_header(path)
+    if 'date' not in header and 'last_modified' in header:
+        header['date'] = header['last_modified']
+    return dict((field, header.get(field)) for field in FIELDS)
+
+
+def build_catalog(data, jobs=None):
+    """Return a catalog entry for every vocabulary version under data."""
+    sources = list(iter_sources(data))
+    with concurrent.futures.ThreadPoolExecutor(jobs) as pool:
+        headers = pool.map(read_metadata, [path for _, _, path in sources])
+        catalog = []
+        for (vocabulary, label, path), metadata in zip(sources, headers):
+            item = {'vocabulary': vocabulary, 'version': label,
+                    'path': os.path.relpath(path, data)}
+            item.update(metadata)
+            catalog.append(item)
+    return catalog
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cfvocab.metadata',
+        description='Retrieves the title and version of vocabulary files, or '
+                    'catalogs every version of every vocabulary.')
+    parser.add_argument('files', nargs='*', help='vocabulary XML files')
+    parser.add_argument('--catalog', metavar='DATA',
+                        help='catalog every version under the Data directory')
+    parser.add_argument('--output', help='catalog file (default: stdout)')
+    parser.add_argument('--jobs', type=int,
+                        help='number of files to read in parallel')
+    args = parser.parse_args(argv)
+
+    if args.catalog:
+        catalog = build_catalog(args.catalog, args.jobs)
+        if args.output:
+            with atomic_write(args.output, 'w', encoding='utf-8') as f:
+                json.dump(catalog, f, indent=1)
+            print('%s - cataloged %d versions' % (args.output, len(catalog)))
+        else:
+            json.dump(catalog, sys.stdout, indent=1)
+            print()
+        return 0
+
+    if not args.files:
+        parser.error('give files to read or --catalog')
+    for path in args.files:
+        metadata = read_metadata(path)
+        print('--------------------------------------------')
+        print(' Title:    %s' % metadata['title'])
+        if metadata['version_number'] is not None:
+            print(' Version:  %s' % metadata['version_number'])
+        print('--------------------------------------------')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+Single-pass post-processing of built HTML files.
+
+The rewrites that used to be separate scripts (encode.py,
+remove-second-title.py and inject-area-type-link.py) are registered here as
+passes. Each file is read once, every selected pass is applied to it in
+turn, and the result is written back once, atomically, if it changed.
+
+Files are decoded as ISO-8859-1, which maps every byte to one character, so
+a pass works the same whatever the real encoding of the file is. They are
+written back in the same encoding unless a pass, such as transcode, sets a
+different one. A file whose <meta> tag already declares UTF-8 is never
+transcoded again.
+"""
+
+import argparse
+import concurrent.futures
+import os
+import re
+import sys
+
+from .fileutil import atomic_write
+from .render import AREA_TYPE_LINK, AREA_TYPE_TEXT
+
+PASSES = {}
+ENCODINGS = {}
+
+# Only the start of a file is searched for the charset in its <meta> tag.
+SNIFF_BYTES = 4096
+_CHARSET = re.compile(br'charset=([-\w]+)', re.IGNORECASE)
+
+
+def register(name, encoding=None):
+    """Register a function from text to text as the pass called name.
+
+    If encoding is given, files the pass is applied to are written in it.
+    """
+    def decorator(func):
+        PASSES[name] = func
+        if encoding:
+            ENCODINGS[name] = encoding
+        return func
+    return decorator
+
+
+@register('charset')
+def charset(text):
+    """Declare UTF-8 instead of ISO-8859-1 in the <meta> tag."""
+    return text.replace('charset=ISO-8859-1', 'charset=utf-8')
+
+
+@register('transcode', encoding='utf-8')
+def transcode(text):
+    """Convert the file from ISO-8859-1 to UTF-8."""
+    return text
+
+
+_H1_TITLE = re.compile('<h1 class="title"(.*?)</h1>', re.DOTALL)
+_H2_TITLE = re.compile('<h2 class="title"(.*?)</h2>', re.DOTALL)
+
+
+@register('remove-second-title')
+def remove_second_title(text):
+    """Remove the first h1 title, or the first h2 title if there is no h1."""
+    fix = _H1_TITLE.sub('', text, 1)
+    if fix == text:
+        fix = _H2_TITLE.sub('', text, 1)
+    return fix
+
+
+@register('area-type-link')
+def area_type_link(text):
+    """Link the first mention of the area_type table."""
+    return text.replace(AREA_TYPE_TEXT, AREA_TYPE_LINK, 1)
+
+
+def declared_charset(data):
+    """Return the lower-case charset declared near the start of data."""
+    m = _CHARSET.search(data, 0, SNIFF_BYTES)
+    return m.group(1).decode('ascii').lower() if m else None
+
+
+def process_file(path, passes):
+    """Apply the named passes to a file. Returns True if it was rewritten."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    encoding = 'iso-8859-1'
+    if declared_charset(data) not in ('utf-8', 'utf8'):
+        for name in passes:
+            encoding = ENCODINGS.get(name, encoding)
+    text = data.decode('iso-8859-1')
+    for name in passes:
+        text = PASSES[name](text)
+    fix = text.encode(encoding)
+    if fix == data:
+        return False
+    with atomic_write(path) as f:
+        f.write(fix)
+    return True
+
+
+def find_files(location, suffix):
+    """Return the files in the directory location that end with suffix."""
+    return sorted(os.path.join(location, name) for name in os.listdir(location)
+                  if name.endswith(suffix))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cfvocab.postprocess',
+        description='Applies post-processing passes to built HTML files.',
+        epilog='Passes: %s' % ', '.join(sorted(PASSES)))
+    parser.add_argument('-p', '--passes', required=True,
+                        help='comma-separated passes, applied in order')
+    parser.add_argument('location', help='a file, or a directory of files')
+    parser.add_argument('suffix', nargs='?', default='html',
+                        help='suffix of the files to process in a directory '
+                             '(default: html)')
+    parser.add_argument('--jobs', type=int,
+                        help='number of files to process in parallel '
+                             '(default: one per CPU)')
+    args = parser.parse_args(argv)
+
+    passes = args.passes.split(',')
+    unknown = [name for name in passes if name not in PASSES]
+    if unknown:
+        parser.error('unknown passes: %s' % ', '.join(unknown))
+    if os.path.isdir(args.location):
+        files = find_files(args.location, args.suffix)
+    else:
+        files = [args.location]
+    with concurrent.futures.ProcessPoolExecutor(args.jobs) as pool:
+        changed = pool.map(process_file, files, [passes] * len(files))
+        for path, rewritten in zip(files, changed):
+            if rewritten:
+                print('%s - %s' % (path, ', '.join(passes)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,256 @@
+"""
+Search of standard name tables with the semantics of the page's search.
+
+A query is the text of the search box, the AND/OR choice and whether help
+text is searched too, as in applyFilter of cf-standard-name-table-1.4.xsl:
+
+  * text without spaces is one case-insensitive regexp, matched against the
+    name and, with help text, against the help;
+  * otherwise each space-separated part is a case-insensitive regexp, and
+    all of them (AND) or any (OR) must match. With AND the parts are
+    matched against the row id, the name followed by "_tr". With help text
+    a row also matches if all, or any, parts match its help.
+
+The help is matched as the innerHTML of the row's _help div, as on the
+page. JavaScript regexps are translated to Python ones where they differ:
+"$" only matches at the very end, and groups are named with (?<name>...).
+
+Each query is compiled once. Parts that are literal text, or literal text
+joined by ".*", are first tested as substrings of the lower-cased names
+and helps, so the regexp only runs on the rows that contain them; the
+other parts of an OR query are combined into one alternation. A table holds
+its names and helps in memory as columns that each part filters in turn,
+so that many queries, such as the category presets of the page, can be run
+against it in a batch.
+"""
+
+import argparse
+import re
+import sys
+
+from .loader import iter_versions
+from .render import TEMPLATE
+from .webfilter import table_helps
+
+_LITERAL = re.compile(r'[A-Za-z0-9_ ,:;=\-\'"!@#%&/<>~`]*\Z')
+_PRESET = re.compile(r"getElementById\('filter_text'\)\.value='([^']*)';\s*"
+                     r"document\.getElementById\('logical_operator_(and|or)'\)"
+                     r"\.click\(\);[^>]*>([^<]*)</a>")
+
+
+def js_pattern(pattern):
+    """Translate a JavaScript regexp to a Python one with the same matches."""
+    out = []
+    i = 0
+    in_class = False
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '\\':
+            out.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if in_class:
+            in_class = c != ']'
+        elif c == '[':
+            in_class = True
+        elif c == '$':
+            c = r'\Z'
+        elif pattern.startswith('(?<', i) and pattern[i + 3:i + 4] not in '=!':
+            c = '(?P<'
+            i += 2
+        out.append(c)
+        i += 1
+    return ''.join(out)
+
+
+def _compile(part):
+    try:
+        return re.compile(js_pattern(part), re.IGNORECASE)
+    except re.error as e:
+        raise ValueError('invalid search term %r: %s' % (part, e))
+
+
+def _part(part):
+    """Return (literals, pattern) for one part of a query.
+
+    A row matches the part if it contains each of the lower-case literals
+    and pattern, if not None, matches it. Parts that are literal text
+    joined by ".*" need the literals; those without ".*" need nothing more.
+    """
+    pieces = part.split('.*')
+    if all(_LITERAL.match(piece) and piece.isascii() for piece in pieces):
+        literals = [piece.lower() for piece in pieces if piece]
+        return literals, _compile(part) if len(pieces) > 1 else None
+    return [], _compile(part)
+
+
+class Query(object):
+    """A compiled search of the page.
+
+    mode is 'and' or 'or', and help is True to search the help text too.
+    """
+
+    def __init__(self, text, mode='and', help=False):
+        if mode not in ('and', 'or'):
+            raise ValueError('mode must be "and" or "or", not %r' % mode)
+        self.text = text
+        self.mode = mode
+        self.help = help
+        if ' ' not in text:
+            parts = [text]
+            self.any = True
+            self.suffix = ''
+        else:
+            parts = text.split(' ')
+            self.any = mode == 'or'
+            self.suffix = '_tr' if mode == 'and' else ''
+        self.parts = []
+        loose = []
+        for part in parts:
+            literals, pattern = _part(part)
+            if self.any and not literals:
+                loose.append(part)
+            else:
+                self.parts.append((literals, pattern))
+        # Parts of an OR query that are only regexps are combined into one
+        # alternation, unless their groups are referred to by number.
+        if len(loose) > 1 and not any(re.search(r'\\[1-9]|\(\?P=', part)
+                                      for part in loose):
+            self.parts.append(([], _compile('|'.join('(?:%s)' % part
+                                                     for part in loose))))
+        else:
+            self.parts.extend(([], _compile(part)) for part in loose)
+        # Cheap substring tests first.
+        self.parts.sort(key=lambda part: part[1] is not None)
+
+    def _test(self, text, lower):
+        found = (all(literal in lower for literal in literals)
+                 and (pattern is None or pattern.search(text) is not None)
+                 for literals, pattern in self.parts)
+        return any(found) if self.any else all(found)
+
+    def matches(self, name, help_html=''):
+        """Return True if the row of name, with help_html, matches."""
+        name += self.suffix
+        if self._test(name, name.lower()):
+            return True
+        return self.help and self._test(help_html, help_html.lower())
+
+    def scan(self, texts, lowers, rows):
+        """Return the rows, ordinals into texts, whose text matches.
+
+        lowers are the texts in lower case.
+        """
+        if not self.any:
+            for literals, pattern in self.parts:
+                for literal in literals:
+                    rows = [i for i in rows if literal in lowers[i]]
+                if pattern is not None:
+                    search = pattern.search
+                    rows = [i for i in rows if search(texts[i])]
+            return rows
+        found = set()
+        for literals, pattern in self.parts:
+            candidates = [i for i in rows if i not in found]
+            for literal in literals:
+                candidates = [i for i in candidates if literal in lowers[i]]
+            if pattern is not None:
+                search = pattern.search
+                candidates = [i for i in candidates if search(texts[i])]
+            found.update(candidates)
+        return sorted(found)
+
+
+class Table(object):
+    """The names and helps of a table file, held in memory as columns."""
+
+    def __init__(self, source):
+        self.names, self.helps = table_helps(source)
+        self._columns = {}
+
+    def _column(self, key):
+        column = self._columns.get(key)
+        if column is None:
+            if key == 'help':
+                texts = self.helps
+            else:
+                texts = [name + key for name in self.names]
+            column = self._columns[key] = (texts,
+                                           [text.lower() for text in texts])
+        return column
+
+    def search(self, query):
+        """Return the ordinals of the rows that match a Query."""
+        texts, lowers = self._column(query.suffix)
+        rows = query.scan(texts, lowers, range(len(texts)))
+        if query.help:
+            matched = set(rows)
+            rest = [i for i in range(len(texts)) if i not in matched]
+            texts, lowers = self._column('help')
+            rows = sorted(matched.union(query.scan(texts, lowers, rest)))
+        return rows
+
+    def search_batch(self, queries):
+        """Return the matching ordinals of each Query in queries."""
+        return [self.search(query) for query in queries]
+
+
+def read_presets(path=TEMPLATE):
+    """Return the (title, Query) category presets of a page or stylesheet."""
+    with open(path, encoding='utf-8') as f:
+        page = f.read()
+    return [(title.strip(), Query(text, mode))
+            for text, mode, title in _PRESET.findall(page)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cfvocab.query',
+        description='Searches standard name tables as the search box of '
+                    'their page does, or runs its category presets.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('search', help='print the names matching a query')
+    p.add_argument('source', help='table XML file')
+    p.add_argument('text', help='the search text')
+    p.add_argument('--or', dest='mode', action='store_const', const='or',
+                   default='and', help='match any part instead of all')
+    p.add_argument('--help-text', action='store_true',
+                   help='also search the help text')
+    p = sub.add_parser('presets', help='count the matches of the category '
+                                       'presets in each table')
+    p.add_argument('source', help='table XML file, or the cf-standard-names '
+                                  'directory with --all')
+    p.add_argument('--all', action='store_true',
+                   help='run the presets on every version under source')
+    p.add_argument('--page', default=TEMPLATE,
+                   help='page or stylesheet with the presets (default: the '
+                        'render template)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'search':
+        try:
+            query = Query(args.text, args.mode, args.help_text)
+        except ValueError as e:
+            parser.error(str(e))
+        table = Table(args.source)
+        for i in table.search(query):
+            print(table.names[i])
+        return 0
+
+    try:
+        presets = read_presets(args.page)
+    except ValueError as e:
+        parser.error('%s: %s' % (args.page, e))
+    if args.all:
+        sources = list(iter_versions(args.source))
+    else:
+        sources = [(args.source, args.source)]
+    print('\t'.join(['version'] + [title for title, _ in presets]))
+    for label, source in sources:
+        found = Table(source).search_batch([query for _, query in presets])
+        print('\t'.join([label] + [str(len(rows)) for rows in found]))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""
+Renders build/cf-standard-name-table.html without xsltproc.
+
+The page is written row by row as the table is streamed, and is the same as
+the output of xsltproc with cf-standard-name-table-1.4.xsl followed by
+inject-area-type-link.py. Aliases come after the entries in the table, so
+they are collected by a first streaming pass that keeps only the aliases.
+
+The page can instead include the scripts of shards.py, which search the
+rows in build/search/ and so let the page be written without them, or of
+webfilter.py, which search the table in a Web Worker. With the script of
+lazyhelp.py the help of the rows is left out and loaded when it is shown.
+autolink.py renders the page with the terms mentioned in the help linked.
+"""
+
+import argparse
+import concurrent.futures
+import os
+import string
+import sys
+from urllib.parse import quote
+
+from .fileutil import atomic_write
+from .loader import Alias, iter_aliases, iter_table, iter_versions, \
+    read_header
+
+TEMPLATE = os.path.join(os.path.dirname(__file__), 'templates',
+                        'cf-standard-name-table.html')
+HTML_FILE = 'cf-standard-name-table.html'
+SEARCH_SCRIPTS = ('search/filter.js', 'search/search.js')
+FILTER_SCRIPTS = ('filter/filter.js', 'filter/filter-page.js')
+HELP_SCRIPTS = ('help/help.js',)
+
+# The only row of a page written without rows, until a search replaces it.
+PLACEHOLDER = ('<tr id="search_placeholder"><td colspan="4"><i>Search the '
+               'standard names above, or show them all.</i></td></tr>\n')
+
+AREA_TYPE_TEXT = 'area_type table'
+AREA_TYPE_URL = ('http://cfconventions.org/Data/area-type-table/current/build/'
+                 'area-type-table.html')
+AREA_TYPE_LINK = '<a href="%s">%s</a>' % (AREA_TYPE_URL, AREA_TYPE_TEXT)
+
+MONTHS = dict(('%02d' % (i + 1), name) for i, name in enumerate((
+    'January', 'February', 'March', 'April', 'May', 'June', 'July',
+    'August', 'September', 'October', 'November', 'December')))
+
+# xsltproc's formatting of the parts of a row that come from xsl:choose.
+NO_HELP = '\n                            No help available.\n                        '
+NO_CODE = '\n                        \xa0\n                    '
+HELP_STYLE = ('display: none; padding-left: 16px; margin-top: 4px; '
+              'border-top: 1px dashed #cccccc;')
+
+
+def escape(text):
+    """Escape text content the way the libxml2 HTML serialiser does."""
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def escape_attribute(text):
+    return escape(text).replace('"', '&quot;')
+
+
+def escape_uri(text):
+    """Escape a link attribute, such as <a name>, as libxml2 does."""
+    return quote(text.lstrip(' \t\r\n'), safe="@/:=?;#%&,+<>!*'()")
+
+
+def _after(s, sep):
+    i = s.find(sep)
+    return s[i + len(sep):] if i >= 0 else ''
+
+
+def format_date(value):
+    """Format a last_modified timestamp as the FormatDate template does."""
+    rest = _after(value, '-')
+    month = rest[:rest.find('-')] if '-' in rest else ''
+    day = _after(rest, '-')[:2]
+    return '%s %s %s' % (day, MONTHS.get(month, ''), value[:4])
+
+
+def render_row(entry, aliases, help=True, linker=None):
+    """Return the <tr> of an entry whose fields are None when absent.
+
+    Without help the row has no _help div. With an autolink.Linker the
+    mentions of terms in the help are linked.
+    """
+    name = escape_attribute(entry.id)
+    parts = ['<tr id="%s_tr">\n<td>\n<a name="%s"></a>'
+             '<img id="%s_arrow" src="../build/media/images/arrow_right.gif">'
+             '<code class="varname"><a href="javascript:void(0)" '
+             'onclick="toggleHelp(\'%s\')">%s</a></code>'
+             % (name, escape_uri(entry.id), name, name, escape(entry.id))]
+    for alias in aliases:
+        parts.append('<div style="padding-left: 16px;">\n<i>alias:</i>\xa0%s'
+                     '</div>\n' % escape(alias))
+    if entry.description == '':
+        help_text = NO_HELP
+    elif linker is not None:
+        help_text = linker.link(entry.description or '', entry.id)
+    else:
+        help_text = escape(entry.description or '')
+    if help:
+        parts.append('<div id="%s_help" style="%s">%s</div>\n</td>\n'
+                     % (name, HELP_STYLE, help_text))
+    else:
+        parts.append('</td>\n' if aliases else '\n</td>\n')
+    parts.append('<td>%s</td>\n' % escape(entry.canonical_units or ''))
+    for code in (entry.amip, entry.grib):
+        parts.append('<td>%s</td>\n'
+                     % (NO_CODE if code is None else escape(code)))
+    parts.append('</tr>\n')
+    return ''.join(parts)
+
+
+def render(source, path, area_type_link=True, rows=True, scripts=(),
+           help=True, linker=None):
+    """Write the HTML page of the table file source to path.
+
+    scripts are the URLs of scripts to include at the end of the body.
+    Without rows the table only holds PLACEHOLDER, and without help its
+    rows have no _help divs. linker, an autolink.Linker, links the mentions
+    of terms in the help.
+    Returns the number of entries written.
+    """
+    aliases = {}
+    for alias in iter_aliases(source):
+        aliases.setdefault(alias.entry_id, []).append(alias.id)
+    header = read_header(source)
+    with open(TEMPLATE, encoding='utf-8') as f:
+        head = string.Template(f.read()).substitute(
+            version=escape(header.get('version_number', '')),
+            date=escape(format_date(header.get('last_modified', ''))))
+
+    count = 0
+    link = area_type_link
+    with atomic_write(path, 'w', encoding='utf-8') as out:
+        out.write(head)
+        if not rows:
+            out.write(PLACEHOLDER)
+        for entry in iter_table(source, missing=None) if rows else ():
+            if type(entry) is Alias:
+                continue
+            row = render_row(entry, aliases.get(entry.id, ()), help, linker)
+            if link and AREA_TYPE_TEXT in row:
+                row = row.replace(AREA_TYPE_TEXT, AREA_TYPE_LINK, 1)
+                link = False
+            out.write(row)
+            count += 1
+        out.write('</table>\n')
+        for script in scripts:
+            out.write('<script src="%s"></script>\n' % escape_attribute(script))
+        out.write('</body>\n</html>\n')
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cfvocab.render',
+        description='Renders the HTML page of a standard name table.')
+    parser.add_argument('source', help='table XML file, or the '
+                                       'cf-standard-names directory with --all')
+    parser.add_argument('output', nargs='?',
+                        help='HTML file (default: build/%s), or with --all '
+                             'the directory to write the pages to' % HTML_FILE)
+    parser.add_argument('--all', action='store_true',
+                        help='write <output>/<version>/%s for every version '
+                             'under source' % HTML_FILE)
+    parser.add_argument('--jobs', type=int,
+                        help='number of versions to render in parallel '
+                             '(default: one per CPU)')
+    parser.add_argument('--no-area-type-link', dest='area_type_link',
+                        action='store_false',
+                        help='do not link the first mention of the '
+                             'area_type table')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--search-shards', action='store_true',
+                       help='write the page without rows, for the search '
+                            'shards of python -m cfvocab.shards')
+    group.add_argument('--worker-filter', action='store_true',
+                       help='search the page in the Web Worker of '
+                            'python -m cfvocab.webfilter')
+    parser.add_argument('--lazy-help', action='store_true',
+                        help='leave out the help of the rows, which is '
+                             'loaded from python -m cfvocab.lazyhelp')
+    args = parser.parse_args(argv)
+    if args.lazy_help and args.search_shards:
+        parser.error('--lazy-help does not apply to --search-shards')
+
+    if args.all:
+        if not args.output:
+            parser.error('--all needs an output directory, such as '
+                         'build/pages, so that the published pages of the '
+                         'versions are not overwritten')
+        jobs = [(source, os.path.join(args.output, label, HTML_FILE))
+                for label, source in iter_versions(args.source)]
+    else:
+        jobs = [(args.source,
+                 args.output or os.path.join('build', HTML_FILE))]
+    for _, output in jobs:
+        os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    scripts = ()
+    if args.search_shards:
+        scripts = SEARCH_SCRIPTS
+    elif args.worker_filter:
+        scripts = FILTER_SCRIPTS
+    if args.lazy_help:
+        scripts += HELP_SCRIPTS
+    with concurrent.futures.ProcessPoolExecutor(args.jobs) as pool:
+        futures = [pool.submit(render, source, output, args.area_type_link,
+                               not args.search_shards, scripts,
+                               not args.lazy_help)
+                   for source, output in jobs]
+        for (_, output), future in zip(jobs, futures):
+            print('%s - rendered %d entries' % (output, future.result()))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
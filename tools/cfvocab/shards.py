@@ -0,0 +1,148 @@
+"""
+Sharded JSON search index for the standard name table page.
+
+The rows of the table are split into shards by the first word of the
+standard name and written as compact JSON files to build/search/shards/.
+The manifest in build/search/ lists the shards and, for every word that
+occurs in a standard name, the shards holding names that contain it;
+help-words.json does the same for the words of the help. The page written
+by render.py --search-shards has no rows, only a placeholder. Its search
+script uses the word indexes to fetch only the shards that can match a
+query and renders the matching rows itself, and a link to #name fetches
+the shard of the name.
+
+    search/manifest.json      {"version": version_number, "count": entries,
+                               "shards": [{"key": first word,
+                                           "file": "shards/<key>.json",
+                                           "count": rows}, ...],
+                               "words": {word: [shard number, ...], ...}}
+    search/help-words.json    {word: [shard number, ...], ...}
+    search/shards/<key>.json  [[ordinal, name, canonical_units, amip, grib,
+                                [alias, ...], help], ...]
+
+amip and grib are null when the entry has no such element, and help is the
+innerHTML of the _help div of the row, as webfilter.py writes it. The
+shards have their own directory, so no key can clash with the other files.
+help-words.json is only fetched by a search of the help text. The page
+loads search.js, and the query matching it shares with webfilter.py,
+filter.js, from build/search/.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+from .fileutil import atomic_write
+from .loader import Alias, iter_aliases, iter_table, iter_versions, \
+    read_header
+from .render import AREA_TYPE_LINK, AREA_TYPE_TEXT
+from .webfilter import SCRIPTS, copy_scripts, help_html
+
+SEARCH_DIR = 'search'
+SHARD_DIR = 'shards'
+MANIFEST_FILE = 'manifest.json'
+HELP_WORDS_FILE = 'help-words.json'
+SEARCH_SCRIPTS = (SCRIPTS[0],
+                  ('cf-standard-name-search.js', 'search.js'))
+
+_WORD = re.compile('[a-z0-9]+')
+
+
+def shard_key(name):
+    """Return the shard of a standard name: its first word, in lower case."""
+    return '-'.join(_WORD.findall(name.split('_')[0].lower())) or '-'
+
+
+def _dump(path, obj):
+    with atomic_write(path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, ensure_ascii=False, separators=(',', ':'))
+
+
+def _word_index(words, numbers):
+    """Return words, from word to shard keys, as word to shard numbers."""
+    return dict((word, sorted(numbers[key] for key in words[word]))
+                for word in sorted(words))
+
+
+def build_shards(source, directory):
+    """Write the search shards of a table file to directory.
+
+    Returns the number of shards.
+    """
+    aliases = {}
+    for alias in iter_aliases(source):
+        aliases.setdefault(alias.entry_id, []).append(alias.id)
+
+    shards = {}
+    words = {}
+    help_words = {}
+    count = 0
+    link = True
+    for entry in iter_table(source, missing=None):
+        if type(entry) is Alias:
+            continue
+        key = shard_key(entry.id)
+        help_text = help_html(entry.description)
+        if link and AREA_TYPE_TEXT in help_text:
+            help_text = help_text.replace(AREA_TYPE_TEXT, AREA_TYPE_LINK, 1)
+            link = False
+        shards.setdefault(key, []).append(
+            [count, entry.id, entry.canonical_units or '', entry.amip,
+             entry.grib, aliases.get(entry.id, []), help_text])
+        for word in _WORD.findall(entry.id.lower()):
+            words.setdefault(word, set()).add(key)
+        for word in _WORD.findall(help_text.lower()):
+            help_words.setdefault(word, set()).add(key)
+        count += 1
+
+    os.makedirs(os.path.join(directory, SHARD_DIR), exist_ok=True)
+    keys = sorted(shards)
+    numbers = dict((key, i) for i, key in enumerate(keys))
+    for key in keys:
+        _dump(os.path.join(directory, SHARD_DIR, '%s.json' % key),
+              shards[key])
+    _dump(os.path.join(directory, HELP_WORDS_FILE),
+          _word_index(help_words, numbers))
+    _dump(os.path.join(directory, MANIFEST_FILE), {
+        'version': read_header(source).get('version_number', ''),
+        'count': count,
+        'shards': [{'key': key, 'file': '%s/%s.json' % (SHARD_DIR, key),
+                    'count': len(shards[key])} for key in keys],
+        'words': _word_index(words, numbers),
+    })
+    copy_scripts(directory, SEARCH_SCRIPTS)
+    return len(keys)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cfvocab.shards',
+        description='Writes the sharded search index of a standard name '
+                    'table page.')
+    parser.add_argument('source', help='table XML file, or the '
+                                       'cf-standard-names directory with --all')
+    parser.add_argument('output', nargs='?',
+                        default=os.path.join('build', SEARCH_DIR),
+                        help='shard directory (default: build/%s)'
+                             % SEARCH_DIR)
+    parser.add_argument('--all', action='store_true',
+                        help='write <version>/build/%s/ for every version '
+                             'under source' % SEARCH_DIR)
+    args = parser.parse_args(argv)
+
+    if args.all:
+        jobs = [(source, os.path.join(args.source, label, 'build',
+                                      SEARCH_DIR))
+                for label, source in iter_versions(args.source)]
+    else:
+        jobs = [(args.source, args.output)]
+    for source, output in jobs:
+        n = build_shards(source, output)
+        print('%s - wrote %d shards' % (output, n))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
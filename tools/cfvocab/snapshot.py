@@ -0,0 +1,247 @@
+"""
+Compiled, memory-mappable snapshots of a standard name table.
+
+A snapshot holds every entry and alias id of one table version, sorted, with
+the canonical units of the standard names each one refers to. It is opened
+with mmap, so looking a name up needs no parsing and the pages are shared by
+every process that has the same snapshot open.
+
+File layout (all integers little-endian):
+
+    header   magic 'CFSN', format (H), reserved (H), row count (I),
+             id count (I)
+    index    one 16 byte row per entry, and per alias and entry it refers
+             to, sorted by the UTF-8 bytes of the id and then by the entry:
+             id offset (I), id length (H), units offset (I), units length (H),
+             target row (I)
+    heap     UTF-8 strings referenced by the index
+
+The target row of an entry is its own row. The target row of an alias is the
+row of the entry it refers to, or NO_TARGET if that entry is not in the table.
+An alias that refers to several entries, such as one that was split, has a
+row for each of them.
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+
+from .fileutil import atomic_write
+from .loader import Alias, iter_table, iter_versions
+
+MAGIC = b'CFSN'
+FORMAT = 2
+HEADER = struct.Struct('<4sHHII')
+ROW = struct.Struct('<IHIHI')
+NO_TARGET = 0xFFFFFFFF
+
+SNAPSHOT_FILE = 'cf-standard-name-table.cfsn'
+
+
+def compile_table(source, path):
+    """Write the snapshot of the table file source to path."""
+    units = {}
+    aliases = {}
+    for record in iter_table(source):
+        if type(record) is Alias:
+            aliases.setdefault(record.id, set()).add(record.entry_id)
+        else:
+            units[record.id] = record.canonical_units
+    # An id that is both an entry and an alias is looked up as the entry.
+    for name in units:
+        aliases.pop(name, None)
+
+    keys = [(name.encode('utf-8'), name, name) for name in units]
+    for name, entry_ids in aliases.items():
+        keys.extend((name.encode('utf-8'), name, entry_id)
+                    for entry_id in entry_ids)
+    keys.sort()
+    rows = dict((name, i) for i, (_, name, _) in enumerate(keys)
+                if name in units)
+
+    heap = bytearray()
+    offsets = {}
+
+    def intern(s):
+        if s not in offsets:
+            data = s.encode('utf-8')
+            offsets[s] = (len(heap), len(data))
+            heap.extend(data)
+        return offsets[s]
+
+    heap_start = HEADER.size + ROW.size * len(keys)
+    index = bytearray()
+    for _, name, entry_id in keys:
+        target = rows.get(entry_id, NO_TARGET)
+        unit = units[entry_id] if target != NO_TARGET else ''
+        id_off, id_len = intern(name)
+        units_off, units_len = intern(unit)
+        index += ROW.pack(heap_start + id_off, id_len,
+                          heap_start + units_off, units_len, target)
+
+    with atomic_write(path) as f:
+        f.write(HEADER.pack(MAGIC, FORMAT, 0, len(keys),
+                            len(units) + len(aliases)))
+        f.write(index)
+        f.write(heap)
+    return len(units) + len(aliases)
+
+
+class Snapshot(object):
+    """Read-only view of a compiled snapshot file.
+
+    >>> snap = Snapshot('build/cf-standard-name-table.cfsn')
+    >>> 'air_temperature' in snap
+    True
+    >>> snap.canonical_units('air_temperature')
+    'K'
+    >>> snap.lookup('surface_carbon_dioxide_mole_flux')
+    [('surface_downward_mole_flux_of_carbon_dioxide', 'mol m-2 s-1'),
+     ('surface_upward_mole_flux_of_carbon_dioxide', 'mol m-2 s-1')]
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, fmt, _, self._count, self._ids = \
+            HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or fmt != FORMAT:
+            self._mm.close()
+            raise ValueError('%s is not a standard name table snapshot' % path)
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._ids
+
+    def _row(self, i):
+        return ROW.unpack_from(self._mm, HEADER.size + ROW.size * i)
+
+    def _id(self, i):
+        off, length = ROW.unpack_from(self._mm, HEADER.size + ROW.size * i)[:2]
+        return self._mm[off:off + length]
+
+    def _find(self, name):
+        """Return the range of the rows of name, or None."""
+        key = name.encode('utf-8')
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._id(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        end = lo
+        while end < self._count and self._id(end) == key:
+            end += 1
+        return (lo, end) if end > lo else None
+
+    def __contains__(self, name):
+        return self._find(name) is not None
+
+    def lookup(self, name):
+        """Return the (standard name, canonical units) of an entry or alias.
+
+        An entry stands for itself. An alias stands for the entries it
+        refers to that are in the table: usually one, several if it was
+        split, none if they are missing. Returns None if name is unknown.
+        """
+        found = self._find(name)
+        if found is None:
+            return None
+        result = []
+        for i in range(*found):
+            _, _, units_off, units_len, target = self._row(i)
+            if target != NO_TARGET:
+                units = self._mm[units_off:units_off + units_len]
+                result.append((self._id(target).decode('utf-8'),
+                               units.decode('utf-8')))
+        return result
+
+    def canonical_units(self, name):
+        """Return the canonical units of name.
+
+        Returns None if name is unknown, or is an alias whose entries are
+        missing or do not all have the same units.
+        """
+        units = set(units for _, units in self.lookup(name) or ())
+        return units.pop() if len(units) == 1 else None
+
+    def is_alias(self, name):
+        """Return True if name is an alias rather than a standard name."""
+        found = self._find(name)
+        return found is not None and self._row(found[0])[4] != found[0]
+
+    def __iter__(self):
+        previous = None
+        for i in range(self._count):
+            name = self._id(i)
+            if name != previous:
+                yield name.decode('utf-8')
+            previous = name
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cfvocab.snapshot',
+        description='Compiles standard name tables into snapshots and looks '
+                    'names up in them.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('compile', help='compile a table, or every version')
+    p.add_argument('source', help='table XML file, or the cf-standard-names '
+                                  'directory with --all')
+    p.add_argument('output', nargs='?',
+                   help='snapshot file (default: %s)' % SNAPSHOT_FILE)
+    p.add_argument('--all', action='store_true',
+                   help='write <version>/build/%s for every version under '
+                        'source' % SNAPSHOT_FILE)
+    p = sub.add_parser('lookup', help='look names up in a snapshot')
+    p.add_argument('snapshot')
+    p.add_argument('names', nargs='+')
+    args = parser.parse_args(argv)
+
+    if args.command == 'compile':
+        if args.all:
+            for label, path in iter_versions(args.source):
+                build = os.path.join(args.source, label, 'build')
+                os.makedirs(build, exist_ok=True)
+                n = compile_table(path, os.path.join(build, SNAPSHOT_FILE))
+                print('%s - compiled %d names' % (label, n))
+        else:
+            output = args.output or SNAPSHOT_FILE
+            n = compile_table(args.source, output)
+            print('%s - compiled %d names' % (output, n))
+        return 0
+
+    status = 0
+    with Snapshot(args.snapshot) as snap:
+        for name in args.names:
+            found = snap.lookup(name)
+            if found is None:
+                print('%s: not a standard name' % name)
+                status = 1
+            elif not found:
+                print('%s: alias of a missing standard name' % name)
+            elif found[0][0] == name:
+                print('%s: [%s]' % (name, found[0][1]))
+            elif len(found) == 1:
+                print('%s: alias of %s [%s]' % (name, found[0][0],
+                                                found[0][1]))
+            else:
+                print('%s: ambiguous alias of %s'
+                      % (name, ', '.join('%s [%s]' % target
+                                         for target in found)))
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""
+SQLite database of every version of the vocabularies.
+
+The standard name tables, area type tables and region lists under Data/ are
+loaded into one SQLite file with the schema below, in a single transaction
+of bulk inserts. Canonical units and descriptions, which repeat from one
+version to the next, are stored once each, and the descriptions have an
+FTS5 full-text index, so SQLite must be built with FTS5 (it usually is).
+
+    versions      (id, vocabulary, label, version_number, date)
+    units         (id, units)
+    descriptions  (id, description), indexed by descriptions_fts
+    terms         (version_id, name, units_id, grib, amip, description_id)
+    aliases       (version_id, name, entry_id)
+
+Where a table repeats an entry, the last one is kept. For example, the
+standard names of the current table whose description mentions "ozone":
+
+    SELECT terms.name FROM terms
+    JOIN versions ON versions.id = terms.version_id
+    JOIN descriptions_fts ON descriptions_fts.rowid = terms.description_id
+    WHERE versions.vocabulary = 'cf-standard-names'
+      AND versions.label = 'current' AND descriptions_fts MATCH 'ozone'
+    ORDER BY descriptions_fts.rank;
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+
+from .fileutil import atomic_path
+from .loader import Alias, iter_sources, iter_table, read_header
+
+DATABASE_FILE = 'cfvocab.sqlite'
+
+SCHEMA = """
+CREATE TABLE versions (
+    id INTEGER PRIMARY KEY,
+    vocabulary TEXT NOT NULL,
+    label TEXT NOT NULL,
+    version_number INTEGER,
+    date TEXT,
+    UNIQUE (vocabulary, label)
+);
+CREATE TABLE units (
+    id INTEGER PRIMARY KEY,
+    units TEXT NOT NULL UNIQUE
+);
+CREATE TABLE descriptions (
+    id INTEGER PRIMARY KEY,
+    description TEXT NOT NULL
+);
+CREATE TABLE terms (
+    version_id INTEGER NOT NULL REFERENCES versions (id),
+    name TEXT NOT NULL,
+    units_id INTEGER REFERENCES units (id),
+    grib TEXT,
+    amip TEXT,
+    description_id INTEGER REFERENCES descriptions (id),
+    PRIMARY KEY (version_id, name)
+);
+CREATE TABLE aliases (
+    version_id INTEGER NOT NULL REFERENCES versions (id),
+    name TEXT NOT NULL,
+    entry_id TEXT NOT NULL,
+    PRIMARY KEY (version_id, name, entry_id)
+);
+CREATE VIRTUAL TABLE descriptions_fts USING fts5(
+    description, content='descriptions', content_rowid='id'
+);
+"""
+
+INDEXES = (
+    'CREATE INDEX terms_name ON terms (name)',
+    'CREATE INDEX terms_description ON terms (description_id)',
+    'CREATE INDEX aliases_name ON aliases (name)',
+    'CREATE INDEX aliases_entry_id ON aliases (entry_id)',
+)
+
+SEARCH = """
+SELECT terms.name FROM terms
+JOIN versions ON versions.id = terms.version_id
+JOIN descriptions_fts ON descriptions_fts.rowid = terms.description_id
+WHERE versions.vocabulary = ? AND versions.label = ?
+  AND descriptions_fts MATCH ?
+ORDER BY descriptions_fts.rank, terms.name
+"""
+
+
+def _number(text):
+    return int(text) if text and text.isdigit() else None
+
+
+class _Codes(dict):
+    """Numbers of distinct values, from 1 in order of first use."""
+
+    def code(self, value):
+        if value is None:
+            return None
+        number = self.get(value)
+        if number is None:
+            number = self[value] = len(self) + 1
+        return number
+
+
+def _load(connection, data):
+    """Insert every vocabulary version under data, and index them.
+
+    Returns the number of versions.
+    """
+    units = _Codes()
+    descriptions = _Codes()
+    versions = []
+    for version_id, (vocabulary, label, source) in enumerate(
+            iter_sources(data), 1):
+        header = read_header(source)
+        versions.append((version_id, vocabulary, label,
+                         _number(header.get('version_number')),
+                         header.get('last_modified') or header.get('date')))
+        terms = []
+        aliases = []
+        for record in iter_table(source, missing=None):
+            if type(record) is Alias:
+                aliases.append((version_id, record.id, record.entry_id))
+            else:
+                terms.append((version_id, record.id,
+                              units.code(record.canonical_units),
+                              record.grib, record.amip,
+                              descriptions.code(record.description)))
+        connection.executemany(
+            'INSERT OR REPLACE INTO terms VALUES (?, ?, ?, ?, ?, ?)', terms)
+        connection.executemany(
+            'INSERT OR IGNORE INTO aliases VALUES (?, ?, ?)', aliases)
+    connection.executemany(
+        'INSERT INTO versions VALUES (?, ?, ?, ?, ?)', versions)
+    connection.executemany('INSERT INTO units VALUES (?, ?)',
+                           ((n, u) for u, n in units.items()))
+    connection.executemany('INSERT INTO descriptions VALUES (?, ?)',
+                           ((n, d) for d, n in descriptions.items()))
+    connection.execute("INSERT INTO descriptions_fts "
+                       "(descriptions_fts) VALUES ('rebuild')")
+    for statement in INDEXES:
+        connection.execute(statement)
+    return len(versions)
+
+
+def build_database(data, path):
+    """Write the database of every vocabulary version under data to path.
+
+    The database is built in a temporary file next to path, which is moved
+    there when it is complete and removed if the build fails, all in a
+    single transaction of bulk inserts. Returns the number of versions.
+    """
+    with atomic_path(path) as temp:
+        connection = sqlite3.connect(temp)
+        try:
+            connection.executescript(SCHEMA)
+            with connection:
+                n = _load(connection, data)
+            connection.execute('VACUUM')
+        finally:
+            connection.close()
+    return n
+
+
+def search(path, query, vocabulary='cf-standard-names', label='current'):
+    """Return the names of a version whose description matches an FTS5
+    query, best matches first."""
+    connection = sqlite3.connect(path)
+    try:
+        return [name for name, in connection.execute(
+            SEARCH, (vocabulary, label, query))]
+    finally:
+        connection.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cfvocab.sqlitedb',
+        description='Builds an SQLite database of every version of the '
+                    'vocabularies, and searches its descriptions.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('build', help='load every version into a database')
+    p.add_argument('data', help='the Data directory of the web site')
+    p.add_argument('output', nargs='?',
+                   default=os.path.join('build', DATABASE_FILE),
+                   help='database file (default: build/%s)' % DATABASE_FILE)
+    p = sub.add_parser('search', help='print the names whose description '
+                                      'matches a full-text query')
+    p.add_argument('database')
+    p.add_argument('query', help='FTS5 query, such as "sea AND ice"')
+    p.add_argument('--vocabulary', default='cf-standard-names',
+                   help='vocabulary to search (default: cf-standard-names)')
+    p.add_argument('--version', default='current',
+                   help='version label to search (default: current)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        n = build_database(args.data, args.output)
+        print('%s - loaded %d versions' % (args.output, n))
+        return 0
+
+    try:
+        names = search(args.database, args.query, args.vocabulary,
+                       args.version)
+    except sqlite3.OperationalError as e:
+        parser.error('invalid query %r: %s' % (args.query, e))
+    for name in names:
+        print(name)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
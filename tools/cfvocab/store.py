@@ -0,0 +1,156 @@
+"""
+Content-addressed store of every standard name table version.
+
+Most entries are repeated unchanged from one version of the table to the
+next, so the store keeps each distinct entry or alias record once, keyed by a
+hash of its content, and describes each version as a manifest: the list of
+record hashes in document order.
+
+Store layout:
+
+    objects.jsonl.gz          one JSON array per line:
+                              [hash, "entry", id, canonical_units, grib, amip,
+                              description] or [hash, "alias", id, entry_id]
+    manifests/<label>.json.gz {"version": label, "records": [hash, ...]}
+"""
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import sys
+
+from .fileutil import atomic_write
+from .loader import Alias, Entry, iter_table, iter_versions, version_key
+
+OBJECTS_FILE = 'objects.jsonl.gz'
+MANIFEST_DIR = 'manifests'
+
+_KINDS = {Entry: 'entry', Alias: 'alias'}
+_CLASSES = {'entry': Entry, 'alias': Alias}
+
+
+def record_fields(record):
+    """Return the (kind, field, ...) tuple that identifies a record."""
+    return (_KINDS[type(record)],) + tuple(getattr(record, s)
+                                           for s in record.__slots__)
+
+
+def record_hash(fields):
+    """Return the content hash of a record_fields() tuple."""
+    data = '\x1f'.join(fields).encode('utf-8')
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def _dump_gz(path, lines):
+    with atomic_write(path) as raw:
+        with gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as gz:
+            with io.TextIOWrapper(gz, encoding='utf-8') as f:
+                for line in lines:
+                    f.write(line)
+                    f.write('\n')
+
+
+def build_store(root, path):
+    """Build a store at path from every version under root.
+
+    root is laid out like Data/cf-standard-names. Returns a tuple of the
+    number of versions and the number of distinct records.
+    """
+    os.makedirs(os.path.join(path, MANIFEST_DIR), exist_ok=True)
+    objects = {}
+    order = []
+    labels = []
+    for label, source in iter_versions(root):
+        hashes = []
+        for record in iter_table(source):
+            fields = record_fields(record)
+            key = record_hash(fields)
+            seen = objects.get(key)
+            if seen is None:
+                objects[key] = fields
+                order.append(key)
+            elif seen != fields:
+                raise ValueError('hash collision between %r and %r'
+                                 % (seen, fields))
+            hashes.append(key)
+        manifest = json.dumps({'version': label, 'records': hashes},
+                              separators=(',', ':'))
+        _dump_gz(os.path.join(path, MANIFEST_DIR, '%s.json.gz' % label),
+                 [manifest])
+        labels.append(label)
+
+    _dump_gz(os.path.join(path, OBJECTS_FILE),
+             (json.dumps([key] + list(objects[key]), ensure_ascii=False,
+                         separators=(',', ':'))
+              for key in order))
+    return len(labels), len(objects)
+
+
+class Store(object):
+    """Reader for a store written by build_store().
+
+    Records are shared between versions: loading every version only costs one
+    object per distinct record plus a list of references per version.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._records = None
+
+    def versions(self):
+        """Return the version labels in the store, in release order."""
+        labels = [name[:-len('.json.gz')]
+                  for name in os.listdir(os.path.join(self.path, MANIFEST_DIR))
+                  if name.endswith('.json.gz')]
+        return sorted(labels, key=version_key)
+
+    def _load_records(self):
+        if self._records is None:
+            records = {}
+            with gzip.open(os.path.join(self.path, OBJECTS_FILE), 'rt',
+                           encoding='utf-8') as f:
+                for line in f:
+                    row = json.loads(line)
+                    records[row[0]] = _CLASSES[row[1]](*row[2:])
+            self._records = records
+        return self._records
+
+    def manifest(self, label):
+        """Return the record hashes of a version, in document order."""
+        path = os.path.join(self.path, MANIFEST_DIR, '%s.json.gz' % label)
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return json.load(f)['records']
+
+    def load_version(self, label):
+        """Return the Entry and Alias records of a version in document order.
+
+        The records are shared with other versions and must not be modified.
+        """
+        records = self._load_records()
+        return [records[key] for key in self.manifest(label)]
+
+    def load_all(self):
+        """Return a dict mapping every version label to its records."""
+        return dict((label, self.load_version(label))
+                    for label in self.versions())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cfvocab.store',
+        description='Builds a deduplicated store of every standard name '
+                    'table version.')
+    parser.add_argument('root', help='the cf-standard-names directory')
+    parser.add_argument('output', help='store directory')
+    args = parser.parse_args(argv)
+    versions, records = build_store(args.root, args.output)
+    print('%s - stored %d versions as %d distinct records'
+          % (args.output, versions, records))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,253 @@
+"""
+"Did you mean" suggestions for misspelt standard names.
+
+The vocabulary is the entry and alias ids of one table, or every name ever
+published in any version, each with the standard names it stands for: an
+entry stands for itself, an alias for the names it resolves to, and a name
+that was withdrawn without an alias for none.
+
+Lookups use symmetric deletes (SymSpell). Every string made by deleting up
+to two characters from the last SUFFIX characters of a name is indexed; a
+query can only be within two edits of the names that share such a string
+with it. The ends of names vary far more than their starts, which share
+long prefixes such as "tendency_of_", so there are few of these candidates,
+and they are checked with the optimal string alignment distance. Matching
+ignores case, so the names are numbered by their lower-case keys.
+
+The index is built once and stored as JSON, delete map included:
+
+    {"version": label or version_number,
+     "max_distance": MAX_DISTANCE, "suffix": SUFFIX,
+     "terms": {name: [standard name, ...], ...},
+     "keys": [lower-case name, ...],
+     "names": [[name, ...], ...],
+     "deletes": {string: "ordinal ordinal ...", ...}}
+
+names lists the names of each key, and deletes the ordinals of the keys
+each string was made from. The ordinals are kept as strings, which JSON
+loads several times faster than lists of numbers.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from .aliases import resolve_history
+from .fileutil import atomic_write
+from .loader import Alias, iter_table, iter_versions, read_header
+
+INDEX_FILE = 'cf-standard-name-table.suggest.json'
+
+MAX_DISTANCE = 2
+SUFFIX = 16
+
+
+def table_terms(source):
+    """Return the entry and alias ids of a table with their standard names."""
+    terms = {}
+    for record in iter_table(source):
+        if type(record) is Alias:
+            terms.setdefault(record.id, set()).add(record.entry_id)
+        else:
+            terms.setdefault(record.id, set()).add(record.id)
+    return dict((term, sorted(names)) for term, names in terms.items())
+
+
+def history_terms(sources):
+    """Return every name in table files in release order, as table_terms().
+
+    Aliases stand for the latest standard names that they resolve to.
+    """
+    entries, closure, published = resolve_history(sources)
+    terms = dict((name, []) for name in published)
+    terms.update((name, list(names)) for name, names in closure.items())
+    terms.update((name, [name]) for name in entries)
+    return terms
+
+
+def build_index(source, path, history=False):
+    """Write the suggestion index of a table file to path.
+
+    With history, source is the cf-standard-names directory and every name
+    of every version is included. Returns the number of names.
+    """
+    if history:
+        versions = list(iter_versions(source))
+        terms = history_terms(source for _, source in versions)
+        version = versions[-1][0]
+    else:
+        terms = table_terms(source)
+        version = read_header(source).get('version_number', '')
+    folded = {}
+    for term in sorted(terms):
+        folded.setdefault(term.lower(), []).append(term)
+    keys = sorted(folded)
+    tails = {}
+    for ordinal, key in enumerate(keys):
+        for tail in deletes(key[-SUFFIX:]):
+            tails.setdefault(tail, []).append(str(ordinal))
+    with atomic_write(path, 'w', encoding='utf-8') as f:
+        json.dump({'version': version,
+                   'max_distance': MAX_DISTANCE,
+                   'suffix': SUFFIX,
+                   'terms': dict((term, terms[term]) for term in sorted(terms)),
+                   'keys': keys,
+                   'names': [folded[key] for key in keys],
+                   'deletes': dict((tail, ' '.join(tails[tail]))
+                                   for tail in sorted(tails))},
+                  f, indent=0, separators=(',', ':'))
+    return len(terms)
+
+
+def deletes(word, distance=MAX_DISTANCE):
+    """Return the strings made by deleting up to distance characters."""
+    found = {word}
+    edge = found
+    for _ in range(distance):
+        edge = {w[:i] + w[i + 1:] for w in edge for i in range(len(w))}
+        found |= edge
+    return found
+
+
+def distance(a, b, limit=MAX_DISTANCE):
+    """Return the optimal string alignment distance of a and b.
+
+    Returns limit + 1 for any distance greater than limit.
+    """
+    start = 0
+    n = min(len(a), len(b))
+    while start < n and a[start] == b[start]:
+        start += 1
+    end = 0
+    n -= start
+    while end < n and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a = a[start:len(a) - end]
+    b = b[start:len(b) - end]
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if not a or not b:
+        return len(a) or len(b)
+
+    # Only cells within limit of the diagonal can be within limit.
+    over = limit + 1
+    before = None
+    previous = [j if j <= limit else over for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        ca = a[i - 1]
+        current = [over] * (len(b) + 1)
+        if i <= limit:
+            current[0] = i
+        low = max(1, i - limit)
+        high = min(len(b), i + limit)
+        for j in range(low, high + 1):
+            cb = b[j - 1]
+            d = previous[j - 1] + (ca != cb)
+            if previous[j] + 1 < d:
+                d = previous[j] + 1
+            if current[j - 1] + 1 < d:
+                d = current[j - 1] + 1
+            if (i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb
+                    and before[j - 2] + 1 < d):
+                d = before[j - 2] + 1
+            current[j] = d
+        if min(current[low - 1:high + 1]) > limit:
+            return over
+        before, previous = previous, current
+    return min(previous[-1], over)
+
+
+class Suggester(object):
+    """Nearest names in an index written by build_index().
+
+    max_distance can be at most that of the index.
+    """
+
+    def __init__(self, path, max_distance=MAX_DISTANCE):
+        with open(path, encoding='utf-8') as f:
+            index = json.load(f)
+        if max_distance > index['max_distance']:
+            raise ValueError('the index only finds names within %d edits'
+                             % index['max_distance'])
+        self.version = index['version']
+        self.terms = dict((term, tuple(names))
+                          for term, names in index['terms'].items())
+        self.max_distance = max_distance
+        self._suffix = index['suffix']
+        self._keys = index['keys']
+        self._names = index['names']
+        self._deletes = index['deletes']
+
+    def _candidates(self, key):
+        found = set()
+        for tail in deletes(key[-self._suffix:], self.max_distance):
+            ordinals = self._deletes.get(tail)
+            if ordinals:
+                found.update(map(int, ordinals.split()))
+        return found
+
+    def suggest(self, name, limit=None):
+        """Return the (distance, name, standard names) within max_distance.
+
+        The nearest come first, then in alphabetical order. Names that
+        differ only in case from the query are at distance 0.
+        """
+        key = name.lower()
+        found = []
+        for ordinal in self._candidates(key):
+            d = distance(key, self._keys[ordinal], self.max_distance)
+            if d <= self.max_distance:
+                for term in self._names[ordinal]:
+                    found.append((d, term, self.terms[term]))
+        found.sort()
+        return found[:limit] if limit else found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cfvocab.suggest',
+        description='Builds the suggestion index of standard names and '
+                    'suggests the nearest names to misspelt ones.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('build', help='write the index of a table, or of '
+                                     'every version')
+    p.add_argument('source', help='table XML file, or the cf-standard-names '
+                                  'directory with --all')
+    p.add_argument('output', nargs='?',
+                   default=os.path.join('build', INDEX_FILE),
+                   help='index file (default: build/%s)' % INDEX_FILE)
+    p.add_argument('--all', action='store_true',
+                   help='include every name of every version under source')
+    p = sub.add_parser('suggest', help='suggest names for misspelt ones')
+    p.add_argument('index')
+    p.add_argument('names', nargs='+')
+    p.add_argument('--limit', type=int, default=5,
+                   help='number of suggestions (default: 5)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        n = build_index(args.source, args.output, args.all)
+        print('%s - wrote %d names' % (args.output, n))
+        return 0
+
+    suggester = Suggester(args.index)
+    for name in args.names:
+        found = suggester.suggest(name, args.limit)
+        if not found:
+            print('%s: no suggestions' % name)
+        for d, term, names in found:
+            if names == (term,):
+                print('%s: %s (%d)' % (name, term, d))
+            elif names:
+                print('%s: %s (%d), now %s'
+                      % (name, term, d, ' '.join(names)))
+            else:
+                print('%s: %s (%d), no standard name in version %s'
+                      % (name, term, d, suggester.version))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,158 @@
+// Search of the standard name table page in a Web Worker.
+//
+// applyFilter replaces the function of the same name in the page. The query
+// is posted to filter-worker.js and only the display of the rows is changed
+// on the main thread, when the indices of the matching rows come back.
+// Typing in the search box filters after a short pause. Where workers are
+// not available, such as some browsers on file: URLs, the query is run on
+// the main thread with filter.js.
+
+var FILTER_DELAY = 250;
+
+var filterState = {worker: null, query: null, rows: null};
+
+function filterBase()
+{
+    var scripts = document.getElementsByTagName('script');
+    for (var i = 0; i < scripts.length; i++)
+    {
+        var src = scripts[i].getAttribute('src') || '';
+        if (src.match(/filter-page\.js$/))
+        {
+            return src.substring(0, src.length - 'filter-page.js'.length);
+        }
+    }
+    return 'filter/';
+}
+
+function filterRows()
+{
+    if (!filterState.rows)
+    {
+        filterState.rows = [];
+        var allTRs = document.getElementById('standard_name_table').getElementsByTagName('tr');
+        for (var i = 0; i < allTRs.length; i++)
+        {
+            if (allTRs[i].id != '')
+            {
+                filterState.rows.push(allTRs[i]);
+            }
+        }
+    }
+    return filterState.rows;
+}
+
+function showMatches(query, matches)
+{
+    var rows = filterRows();
+    var is_match = [];
+    for (var i = 0; i < matches.length; i++)
+    {
+        is_match[matches[i]] = true;
+    }
+    for (var i = 0; i < rows.length; i++)
+    {
+        var curTR = rows[i];
+        var display = is_match[i] ? '' : 'none';
+        if (curTR.style.display != display)
+        {
+            curTR.style.display = display;
+        }
+        if (is_match[i])
+        {
+            if (query.search_help_text)
+            {
+                showHelp(curTR.id.substring(0, curTR.id.length - 3));
+            }
+            else
+            {
+                hideHelp(curTR.id.substring(0, curTR.id.length - 3));
+            }
+        }
+    }
+
+    var filter_matches = document.getElementById('filter_matches');
+    var filter_matches_num = document.getElementById('filter_matches_num');
+    var filter_matches_query = document.getElementById('filter_matches_query');
+
+    if (query.filter_text != '')
+    {
+        filter_matches.style.visibility = 'visible';
+        filter_matches_num.innerHTML = matches.length;
+        filter_matches_query.innerHTML = query.filter_text;
+    }
+    else
+    {
+        filter_matches.style.visibility = 'hidden';
+    }
+}
+
+function filterOnMainThread(query)
+{
+    var rows = filterRows();
+    var names = [];
+    var helps = [];
+    for (var i = 0; i < rows.length; i++)
+    {
+        var name = rows[i].id.substring(0, rows[i].id.length - 3);
+        names.push(name);
+        helps.push(query.search_help_text ? document.getElementById(name + '_help').innerHTML : '');
+    }
+    showMatches(query, filterIndices(names, helps, query.filter_text, query.is_boolean_and,
+                                     query.search_help_text));
+}
+
+function applyFilter(filter_text)
+{
+    var query = {
+        id: (filterState.query ? filterState.query.id : 0) + 1,
+        filter_text: filter_text,
+        is_boolean_and: document.getElementById('logical_operator_and').checked,
+        search_help_text: document.getElementById('search_help_text').checked
+    };
+    filterState.query = query;
+    if (filterState.worker)
+    {
+        filterState.worker.postMessage(query);
+    }
+    else
+    {
+        filterOnMainThread(query);
+    }
+}
+
+try
+{
+    filterState.worker = new Worker(filterBase() + 'filter-worker.js');
+    filterState.worker.onmessage = function(event)
+    {
+        // Answers to queries that have since been replaced are dropped.
+        if (filterState.query && event.data.id == filterState.query.id && event.data.matches)
+        {
+            showMatches(filterState.query, event.data.matches);
+        }
+    };
+    filterState.worker.onerror = function()
+    {
+        filterState.worker = null;
+        if (filterState.query)
+        {
+            filterOnMainThread(filterState.query);
+        }
+    };
+}
+catch (e)
+{
+    filterState.worker = null;
+}
+
+(function()
+{
+    var filter_text = document.getElementById('filter_text');
+    var timer = null;
+    filter_text.addEventListener('input', function()
+    {
+        clearTimeout(timer);
+        timer = setTimeout(function() { applyFilter(filter_text.value); }, FILTER_DELAY);
+    });
+})();
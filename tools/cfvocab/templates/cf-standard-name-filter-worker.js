@@ -0,0 +1,26 @@
+// Web Worker that runs the search of the standard name table page.
+//
+// It loads the names and helps of the table from filter-data.json, and
+// answers each message {id, filter_text, is_boolean_and, search_help_text}
+// with {id, matches}, the indices of the matching rows, or {id, error}.
+
+importScripts('filter.js');
+
+var request = new XMLHttpRequest();
+request.open('GET', 'filter-data.json', false);
+request.send();
+var data = JSON.parse(request.responseText);
+
+onmessage = function(event)
+{
+    var query = event.data;
+    try
+    {
+        postMessage({id: query.id, matches: filterIndices(data.names, data.helps, query.filter_text,
+                                                          query.is_boolean_and, query.search_help_text)});
+    }
+    catch (e)
+    {
+        postMessage({id: query.id, error: String(e)});
+    }
+};
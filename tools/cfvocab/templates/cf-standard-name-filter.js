@@ -0,0 +1,58 @@
+// Matching for the search of the standard name table page, shared by the
+// page, its Web Worker and the Node benchmark.
+//
+// The semantics are those of applyFilter in cf-standard-name-table-1.4.xsl.
+// A query without spaces is a case-insensitive regexp matched against the
+// name. Otherwise each space-separated part is a case-insensitive regexp,
+// and all of them (AND) or any of them (OR) must match. With AND the parts
+// are matched against the row id, the name followed by "_tr". With help
+// text, a row also matches when its help, as the innerHTML of its _help
+// div, matches in the same way. The patterns are compiled once per query.
+
+function compileFilter(filter_text, is_boolean_and, search_help_text)
+{
+    if (filter_text.indexOf(' ') == -1)
+    {
+        var re = new RegExp(filter_text, 'i');
+        return function(name, help)
+        {
+            return re.test(name) || (search_help_text && re.test(help));
+        };
+    }
+    var res = filter_text.split(' ').map(function(part) { return new RegExp(part, 'i'); });
+    var matches = function(text)
+    {
+        for (var j = 0; j < res.length; j++)
+        {
+            if (res[j].test(text) != is_boolean_and)
+            {
+                return !is_boolean_and;
+            }
+        }
+        return is_boolean_and;
+    };
+    return function(name, help)
+    {
+        return matches(is_boolean_and ? name + '_tr' : name) || (search_help_text && matches(help));
+    };
+}
+
+// The indices of the names, with their helps, that match a query.
+function filterIndices(names, helps, filter_text, is_boolean_and, search_help_text)
+{
+    var is_match = compileFilter(filter_text, is_boolean_and, search_help_text);
+    var found = [];
+    for (var i = 0; i < names.length; i++)
+    {
+        if (is_match(names[i], search_help_text ? helps[i] : ''))
+        {
+            found.push(i);
+        }
+    }
+    return found;
+}
+
+if (typeof module != 'undefined')
+{
+    module.exports = {compileFilter: compileFilter, filterIndices: filterIndices};
+}
@@ -0,0 +1,148 @@
+// Help of a standard name table page rendered without its _help divs.
+//
+// The help of every entry is in help.json, indexed by the ordinal of its
+// row. It is fetched once, on the first toggleHelp or showHelp or search of
+// the help text, and the _help div of a row is created when it is needed.
+// If help.json cannot be fetched or read, the rows have no help.
+// toggleHelp, showHelp and applyFilter wrap the functions already on the
+// page, so this script must come after any other search script.
+
+var HELP_STYLE = 'display: none; padding-left: 16px; margin-top: 4px; border-top: 1px dashed #cccccc;';
+
+var helpState = {helps: null, waiting: [], rows: null};
+
+function helpBase()
+{
+    var scripts = document.getElementsByTagName('script');
+    for (var i = 0; i < scripts.length; i++)
+    {
+        var src = scripts[i].getAttribute('src') || '';
+        if (src.match(/help\.js$/))
+        {
+            return src.substring(0, src.length - 'help.js'.length);
+        }
+    }
+    return 'help/';
+}
+
+function withHelps(callback)
+{
+    if (helpState.helps)
+    {
+        callback();
+        return;
+    }
+    helpState.waiting.push(callback);
+    if (helpState.waiting.length > 1)
+    {
+        return;
+    }
+    var request = new XMLHttpRequest();
+    request.onreadystatechange = function()
+    {
+        if (request.readyState == 4)
+        {
+            helpState.helps = [];
+            if (request.status == 200 || request.status == 0)
+            {
+                try
+                {
+                    helpState.helps = JSON.parse(request.responseText);
+                }
+                catch (e)
+                {
+                }
+            }
+            var waiting = helpState.waiting;
+            helpState.waiting = [];
+            for (var i = 0; i < waiting.length; i++)
+            {
+                waiting[i]();
+            }
+        }
+    };
+    request.open('GET', helpBase() + 'help.json', true);
+    request.send();
+}
+
+// The rows of the table, in order, by standard name.
+function helpRows()
+{
+    if (!helpState.rows)
+    {
+        helpState.rows = {};
+        var ordinal = 0;
+        var allTRs = document.getElementById('standard_name_table').getElementsByTagName('tr');
+        for (var i = 0; i < allTRs.length; i++)
+        {
+            if (allTRs[i].id != '' && !helpState.rows[allTRs[i].id])
+            {
+                helpState.rows[allTRs[i].id] = {tr: allTRs[i], ordinal: ordinal};
+            }
+            if (allTRs[i].id != '')
+            {
+                ordinal++;
+            }
+        }
+    }
+    return helpState.rows;
+}
+
+// Creates the _help div of a standard name if it is not there yet and
+// there is help for it.
+function addHelp(standard_name)
+{
+    if (document.getElementById(standard_name + '_help'))
+    {
+        return;
+    }
+    var row = helpRows()[standard_name + '_tr'];
+    if (row && helpState.helps[row.ordinal] !== undefined)
+    {
+        var helpDiv = document.createElement('div');
+        helpDiv.id = standard_name + '_help';
+        helpDiv.setAttribute('style', HELP_STYLE);
+        helpDiv.innerHTML = helpState.helps[row.ordinal];
+        row.tr.cells[0].appendChild(helpDiv);
+    }
+}
+
+var pageToggleHelp = toggleHelp;
+var pageShowHelp = showHelp;
+var pageApplyFilter = applyFilter;
+
+toggleHelp = function(standard_name)
+{
+    withHelps(function()
+    {
+        addHelp(standard_name);
+        pageToggleHelp(standard_name);
+    });
+};
+
+showHelp = function(standard_name)
+{
+    withHelps(function()
+    {
+        addHelp(standard_name);
+        pageShowHelp(standard_name);
+    });
+};
+
+applyFilter = function(filter_text)
+{
+    if (!document.getElementById('search_help_text').checked)
+    {
+        pageApplyFilter(filter_text);
+        return;
+    }
+    withHelps(function()
+    {
+        var rows = helpRows();
+        for (var id in rows)
+        {
+            addHelp(id.substring(0, id.length - 3));
+        }
+        pageApplyFilter(filter_text);
+    });
+};
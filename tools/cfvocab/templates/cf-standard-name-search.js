@@ -0,0 +1,444 @@
+// Search for a standard name table page rendered without its rows.
+//
+// The rows are in JSON shards, one per first word of the standard names,
+// listed in search/manifest.json with the shards that hold each word of the
+// names; search/help-words.json lists those of each word of the help and is
+// only fetched by a search of the help text. applyFilter and clearFilter
+// replace the functions of the same name in the page and keep their
+// behaviour, but only fetch the shards that can hold a match and render just
+// the matching rows. Rows are matched by compileFilter from filter.js. A
+// link to #name fetches the shard of the name and shows its row.
+
+var searchIndex = {manifest: null, helpWords: null, shards: [], waiting: {}};
+
+var NO_CODE = '\n                        &nbsp;\n                    ';
+var HELP_STYLE = 'display: none; padding-left: 16px; margin-top: 4px; border-top: 1px dashed #cccccc;';
+
+function searchBase()
+{
+    var scripts = document.getElementsByTagName('script');
+    for (var i = 0; i < scripts.length; i++)
+    {
+        var src = scripts[i].getAttribute('src') || '';
+        if (src.match(/search\.js$/))
+        {
+            return src.substring(0, src.length - 'search.js'.length);
+        }
+    }
+    return 'search/';
+}
+
+function fetchJSON(url, callback)
+{
+    var request = new XMLHttpRequest();
+    request.onreadystatechange = function()
+    {
+        if (request.readyState == 4)
+        {
+            var value = null;
+            if (request.status == 200 || request.status == 0)
+            {
+                try
+                {
+                    value = JSON.parse(request.responseText);
+                }
+                catch (e)
+                {
+                }
+            }
+            callback(value);
+        }
+    };
+    request.open('GET', url, true);
+    request.send();
+}
+
+// Fetches a file of search/ once, as searchIndex[key], and calls back with
+// it. Callbacks that come while it is being fetched wait for it.
+function withFile(key, file, empty, callback)
+{
+    if (searchIndex[key])
+    {
+        callback(searchIndex[key]);
+        return;
+    }
+    var waiting = searchIndex.waiting[key];
+    if (waiting)
+    {
+        waiting.push(callback);
+        return;
+    }
+    searchIndex.waiting[key] = [callback];
+    fetchJSON(searchBase() + file, function(value)
+    {
+        searchIndex[key] = value || empty;
+        var waiting = searchIndex.waiting[key];
+        delete searchIndex.waiting[key];
+        for (var i = 0; i < waiting.length; i++)
+        {
+            waiting[i](searchIndex[key]);
+        }
+    });
+}
+
+function withManifest(callback)
+{
+    withFile('manifest', 'manifest.json', {count: 0, shards: [], words: {}}, callback);
+}
+
+function withHelpWords(callback)
+{
+    withFile('helpWords', 'help-words.json', {}, callback);
+}
+
+// Fetches the given shard numbers and calls back with their rows, in table
+// order. Shards already fetched are not fetched again; while a shard is
+// being fetched, searchIndex.shards holds the callbacks waiting for it.
+function loadShards(numbers, callback)
+{
+    var manifest = searchIndex.manifest;
+    var pending = 1;
+    var done = function()
+    {
+        if (--pending > 0)
+        {
+            return;
+        }
+        var rows = [];
+        for (var i = 0; i < numbers.length; i++)
+        {
+            rows = rows.concat(searchIndex.shards[numbers[i]].rows);
+        }
+        rows.sort(function(a, b) { return a[0] - b[0]; });
+        callback(rows);
+    };
+    for (var i = 0; i < numbers.length; i++)
+    {
+        var shard = searchIndex.shards[numbers[i]];
+        if (shard && shard.rows)
+        {
+            continue;
+        }
+        pending++;
+        if (shard)
+        {
+            shard.waiting.push(done);
+            continue;
+        }
+        searchIndex.shards[numbers[i]] = {rows: null, waiting: [done]};
+        (function(number)
+        {
+            fetchJSON(searchBase() + manifest.shards[number].file, function(rows)
+            {
+                var shard = searchIndex.shards[number];
+                shard.rows = rows || [];
+                for (var j = 0; j < shard.waiting.length; j++)
+                {
+                    shard.waiting[j]();
+                }
+                shard.waiting = [];
+            });
+        })(numbers[i]);
+    }
+    done();
+}
+
+function allShards()
+{
+    var numbers = [];
+    for (var i = 0; i < searchIndex.manifest.shards.length; i++)
+    {
+        numbers.push(i);
+    }
+    return numbers;
+}
+
+// The shards that may match one search term, from a word index, or null for
+// all of them. Only terms made of letters, digits and underscores, possibly
+// joined by ".*", narrow the search: each of their words must occur within
+// some indexed word. With AND, terms are matched against the row id, which
+// ends in "_tr", so a term that could match across that ending narrows
+// nothing either.
+function shardsForTerm(words, term, row_id)
+{
+    if (!term.match(/^[A-Za-z0-9_]+(\.\*[A-Za-z0-9_]+)*$/))
+    {
+        return null;
+    }
+    term = term.toLowerCase();
+    var last = term.substring(term.lastIndexOf('*') + 1);
+    if (row_id && ('_tr'.indexOf(last) != -1 || last.match(/_(tr?)?$/)))
+    {
+        return null;
+    }
+    var found = null;
+    var parts = term.split(/_|\.\*/);
+    for (var i = 0; i < parts.length; i++)
+    {
+        if (parts[i] == '')
+        {
+            continue;
+        }
+        var numbers = {};
+        for (var word in words)
+        {
+            if (word.indexOf(parts[i]) != -1)
+            {
+                for (var j = 0; j < words[word].length; j++)
+                {
+                    numbers[words[word][j]] = true;
+                }
+            }
+        }
+        if (found)
+        {
+            for (var number in found)
+            {
+                if (!numbers[number])
+                {
+                    delete found[number];
+                }
+            }
+        }
+        else
+        {
+            found = numbers;
+        }
+    }
+    if (!found)
+    {
+        return null;
+    }
+    var result = [];
+    for (var number in found)
+    {
+        result.push(parseInt(number, 10));
+    }
+    return result;
+}
+
+// The shards that may hold a row whose name, or whose help, matches a whole
+// query, from one word index, or null for all of them.
+function shardsForText(words, filter_text, is_boolean_and, row_id)
+{
+    if (filter_text.indexOf(' ') == -1)
+    {
+        return shardsForTerm(words, filter_text, false);
+    }
+    var string_parts = filter_text.split(' ');
+    var found = null;
+    for (var i = 0; i < string_parts.length; i++)
+    {
+        var numbers = shardsForTerm(words, string_parts[i], row_id);
+        if (is_boolean_and)
+        {
+            if (numbers)
+            {
+                found = found ? found.filter(function(n) { return numbers.indexOf(n) != -1; }) : numbers;
+            }
+        }
+        else
+        {
+            if (!numbers)
+            {
+                return null;
+            }
+            found = found || [];
+            for (var j = 0; j < numbers.length; j++)
+            {
+                if (found.indexOf(numbers[j]) == -1)
+                {
+                    found.push(numbers[j]);
+                }
+            }
+        }
+    }
+    return found;
+}
+
+// The shards that may hold a match of a query: those of the names and, with
+// help_words, those of the help.
+function shardsForQuery(filter_text, is_boolean_and, help_words)
+{
+    var found = shardsForText(searchIndex.manifest.words, filter_text, is_boolean_and, is_boolean_and);
+    if (found && help_words)
+    {
+        var helps = shardsForText(help_words, filter_text, is_boolean_and, false);
+        if (!helps)
+        {
+            return allShards();
+        }
+        for (var i = 0; i < helps.length; i++)
+        {
+            if (found.indexOf(helps[i]) == -1)
+            {
+                found.push(helps[i]);
+            }
+        }
+    }
+    return found || allShards();
+}
+
+function escapeText(text)
+{
+    return text.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+}
+
+function escapeAttribute(text)
+{
+    return escapeText(text).replace(/"/g, '&quot;');
+}
+
+function rowHTML(row)
+{
+    var name = escapeAttribute(row[1]);
+    var html = '<td>\n<a name="' + encodeURI(row[1].replace(/^\s+/, '')) + '"></a>'
+        + '<img id="' + name + '_arrow" src="../build/media/images/arrow_right.gif">'
+        + '<code class="varname"><a href="javascript:void(0)" onclick="toggleHelp(\'' + name + '\')">'
+        + escapeText(row[1]) + '</a></code>';
+    for (var i = 0; i < row[5].length; i++)
+    {
+        html += '<div style="padding-left: 16px;">\n<i>alias:</i>&nbsp;' + escapeText(row[5][i]) + '</div>\n';
+    }
+    html += '<div id="' + name + '_help" style="' + HELP_STYLE + '">' + row[6] + '</div>\n</td>\n'
+        + '<td>' + escapeText(row[2]) + '</td>\n';
+    for (var i = 3; i < 5; i++)
+    {
+        html += '<td>' + (row[i] === null ? NO_CODE : escapeText(row[i])) + '</td>\n';
+    }
+    return html;
+}
+
+// Replaces the rows of the table, or its placeholder, with the given rows.
+function showRows(rows, search_help_text)
+{
+    var curTable = document.getElementById('standard_name_table');
+    var tbody = curTable.tBodies.length ? curTable.tBodies[0] : curTable;
+    var allTRs = curTable.getElementsByTagName('tr');
+    for (var i = allTRs.length - 1; i >= 0; i--)
+    {
+        if (allTRs[i].id != '')
+        {
+            allTRs[i].parentNode.removeChild(allTRs[i]);
+        }
+    }
+    for (var i = 0; i < rows.length; i++)
+    {
+        var curTR = document.createElement('tr');
+        curTR.id = rows[i][1] + '_tr';
+        curTR.innerHTML = rowHTML(rows[i]);
+        tbody.appendChild(curTR);
+        if (search_help_text)
+        {
+            showHelp(rows[i][1]);
+        }
+    }
+}
+
+function showMatches(filter_text, count)
+{
+    var filter_matches = document.getElementById('filter_matches');
+    var filter_matches_num = document.getElementById('filter_matches_num');
+    var filter_matches_query = document.getElementById('filter_matches_query');
+
+    if (filter_text != '')
+    {
+        filter_matches.style.visibility = 'visible';
+        filter_matches_num.innerHTML = count;
+        filter_matches_query.innerHTML = filter_text;
+    }
+    else
+    {
+        filter_matches.style.visibility = 'hidden';
+    }
+}
+
+function applyFilter(filter_text)
+{
+    var search_help_text = (document.getElementById('search_help_text').checked);
+    var is_boolean_and = (document.getElementById('logical_operator_and').checked);
+
+    var search = function(help_words)
+    {
+        loadShards(shardsForQuery(filter_text, is_boolean_and, help_words), function(rows)
+        {
+            var is_match = compileFilter(filter_text, is_boolean_and, search_help_text);
+            var matches = [];
+            for (var i = 0; i < rows.length; i++)
+            {
+                if (is_match(rows[i][1], search_help_text ? rows[i][6] : ''))
+                {
+                    matches.push(rows[i]);
+                }
+            }
+            showRows(matches, search_help_text);
+            showMatches(filter_text, matches.length);
+        });
+    };
+    withManifest(function(manifest)
+    {
+        if (search_help_text)
+        {
+            withHelpWords(search);
+        }
+        else
+        {
+            search(null);
+        }
+    });
+}
+
+function clearFilter()
+{
+    withManifest(function(manifest)
+    {
+        loadShards(allShards(), function(rows)
+        {
+            showRows(rows, false);
+        });
+    });
+
+    var filter_matches = document.getElementById('filter_matches');
+    filter_matches.style.visibility = 'hidden';
+
+    document.getElementById('filter_text').value = '';
+}
+
+// The shard of a standard name, as shard_key() in shards.py.
+function shardKey(name)
+{
+    var words = name.split('_')[0].toLowerCase().match(/[a-z0-9]+/g);
+    return words ? words.join('-') : '-';
+}
+
+// Shows the row of the name in the URL, such as those the KWIC index links
+// to, with its help, fetching only its shard.
+function showLinkedRow()
+{
+    var name = decodeURIComponent(window.location.hash.substring(1));
+    if (name == '' || document.getElementById(name + '_tr'))
+    {
+        return;
+    }
+    withManifest(function(manifest)
+    {
+        for (var i = 0; i < manifest.shards.length; i++)
+        {
+            if (manifest.shards[i].key == shardKey(name))
+            {
+                loadShards([i], function(rows)
+                {
+                    showRows(rows.filter(function(row) { return row[1] == name; }), true);
+                    var anchors = document.getElementsByName(name);
+                    if (anchors.length)
+                    {
+                        anchors[0].scrollIntoView();
+                    }
+                });
+            }
+        }
+    });
+}
+
+window.addEventListener('load', showLinkedRow);
+window.addEventListener('hashchange', showLinkedRow);
@@ -0,0 +1,169 @@
+"""
+Inverted index of the words in standard names.
+
+Each standard name is split into its underscore-separated words. Every word,
+and every phrase of consecutive words such as "sea_water" or "tendency_of",
+is a key whose posting list holds the sorted ordinals of the entries whose
+names contain it. Queries for several keys merge the posting lists: an
+intersection for AND and a union for OR.
+
+The index is stored as gzipped JSON, by default next to the other build
+output of the version as build/cf-standard-name-table.tokens.json.gz:
+
+    {"version": version_number, "names": [name, ...],
+     "postings": {key: [first ordinal, gap, gap, ...], ...}}
+"""
+
+import argparse
+import gzip
+import heapq
+import itertools
+import json
+import os
+import sys
+
+from .fileutil import atomic_write
+from .loader import iter_entries, iter_versions, read_header
+
+INDEX_FILE = 'cf-standard-name-table.tokens.json.gz'
+
+
+def name_keys(name):
+    """Return the set of words and phrases of a standard name."""
+    words = [word for word in name.lower().split('_') if word]
+    keys = set()
+    for start in range(len(words)):
+        for stop in range(start + 1, len(words) + 1):
+            keys.add('_'.join(words[start:stop]))
+    return keys
+
+
+def build_postings(names):
+    """Return a dict of key to sorted list of ordinals into names."""
+    postings = {}
+    for ordinal, name in enumerate(names):
+        for key in name_keys(name):
+            postings.setdefault(key, []).append(ordinal)
+    return postings
+
+
+def _gaps(ordinals):
+    return [b - a for a, b in zip([0] + ordinals, ordinals)]
+
+
+def build_index(source, path):
+    """Write the index of a table file to path. Returns the number of keys."""
+    names = [entry.id for entry in iter_entries(source)]
+    postings = build_postings(names)
+    index = {'version': read_header(source).get('version_number', ''),
+             'names': names,
+             'postings': dict((key, _gaps(postings[key]))
+                              for key in sorted(postings))}
+    with atomic_write(path) as raw:
+        with gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as f:
+            f.write(json.dumps(index, separators=(',', ':')).encode('utf-8'))
+    return len(postings)
+
+
+def intersect(lists):
+    """Return the sorted ordinals common to every sorted list in lists."""
+    lists = sorted(lists, key=len)
+    if not lists:
+        return []
+    result = lists[0]
+    for other in lists[1:]:
+        merged = []
+        i = j = 0
+        while i < len(result) and j < len(other):
+            if result[i] == other[j]:
+                merged.append(result[i])
+                i += 1
+                j += 1
+            elif result[i] < other[j]:
+                i += 1
+            else:
+                j += 1
+        result = merged
+        if not result:
+            break
+    return result
+
+
+def union(lists):
+    """Return the sorted ordinals in any of the sorted lists in lists."""
+    return [ordinal for ordinal, _ in
+            itertools.groupby(heapq.merge(*lists))]
+
+
+class TokenIndex(object):
+    """Reader for an index written by build_index().
+
+    Posting lists are decoded the first time their key is queried.
+    """
+
+    def __init__(self, path):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            index = json.load(f)
+        self.version = index['version']
+        self.names = index['names']
+        self._postings = index['postings']
+        self._decoded = {}
+
+    def postings(self, key):
+        """Return the sorted entry ordinals of a word or phrase."""
+        key = '_'.join(word for word in key.lower().split('_') if word)
+        found = self._decoded.get(key)
+        if found is None:
+            found = list(itertools.accumulate(self._postings.get(key, ())))
+            self._decoded[key] = found
+        return found
+
+    def query(self, keys, mode='and'):
+        """Return the names matching all (mode 'and') or any ('or') keys."""
+        lists = [self.postings(key) for key in keys]
+        ordinals = intersect(lists) if mode == 'and' else union(lists)
+        return [self.names[ordinal] for ordinal in ordinals]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cfvocab.tokenindex',
+        description='Builds and queries the inverted index of the words in '
+                    'standard names.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('build', help='index a table, or every version')
+    p.add_argument('source', help='table XML file, or the cf-standard-names '
+                                  'directory with --all')
+    p.add_argument('output', nargs='?',
+                   default=os.path.join('build', INDEX_FILE),
+                   help='index file (default: build/%s)' % INDEX_FILE)
+    p.add_argument('--all', action='store_true',
+                   help='write <version>/build/%s for every version under '
+                        'source' % INDEX_FILE)
+    p = sub.add_parser('query', help='find the names containing words')
+    p.add_argument('index')
+    p.add_argument('keys', nargs='+', help='words or phrases, e.g. sea_water')
+    p.add_argument('--or', dest='mode', action='store_const', const='or',
+                   default='and', help='match any key instead of all of them')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        if args.all:
+            jobs = [(source, os.path.join(args.source, label, 'build',
+                                          INDEX_FILE))
+                    for label, source in iter_versions(args.source)]
+        else:
+            jobs = [(args.source, args.output)]
+        for source, output in jobs:
+            os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+            n = build_index(source, output)
+            print('%s - indexed %d words and phrases' % (output, n))
+        return 0
+
+    for name in TokenIndex(args.index).query(args.keys, args.mode):
+        print(name)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
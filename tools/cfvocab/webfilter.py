@@ -0,0 +1,100 @@
+"""
+Search of the standard name table page in a Web Worker.
+
+The names of the table and their help, as the innerHTML of the hidden
+_help divs, are written once to build/filter/filter-data.json, with the
+scripts that filter the page off the main thread:
+
+    filter.js         query matching, shared with the Node benchmark
+    filter-worker.js  the worker, which loads filter-data.json
+    filter-page.js    applyFilter for the page, with a debounced search box
+
+The page including these scripts is written by render.py --worker-filter.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+
+from .fileutil import atomic_write
+from .loader import Alias, iter_table
+from .render import AREA_TYPE_LINK, AREA_TYPE_TEXT, NO_HELP, escape
+
+FILTER_DIR = 'filter'
+DATA_FILE = 'filter-data.json'
+TEMPLATES = os.path.join(os.path.dirname(__file__), 'templates')
+SCRIPTS = (('cf-standard-name-filter.js', 'filter.js'),
+           ('cf-standard-name-filter-worker.js', 'filter-worker.js'),
+           ('cf-standard-name-filter-page.js', 'filter-page.js'))
+
+
+def help_html(description):
+    """Return the innerHTML of the _help div of a description, or None."""
+    if description == '':
+        return NO_HELP
+    return escape(description or '').replace('\xa0', '&nbsp;')
+
+
+def copy_scripts(directory, scripts=SCRIPTS):
+    """Copy template scripts to directory under their published names."""
+    for template, name in scripts:
+        shutil.copyfile(os.path.join(TEMPLATES, template),
+                        os.path.join(directory, name))
+
+
+def table_helps(source):
+    """Return the names of a table's entries and their help HTML, in order.
+
+    The first help that mentions the area_type table links to it, as on the
+    page.
+    """
+    names = []
+    helps = []
+    link = True
+    for entry in iter_table(source, missing=None):
+        if type(entry) is Alias:
+            continue
+        help_text = help_html(entry.description)
+        if link and AREA_TYPE_TEXT in help_text:
+            help_text = help_text.replace(AREA_TYPE_TEXT, AREA_TYPE_LINK, 1)
+            link = False
+        names.append(entry.id)
+        helps.append(help_text)
+    return names, helps
+
+
+def build_filter(source, directory):
+    """Write the filter data and scripts of a table file to directory.
+
+    Returns the number of entries.
+    """
+    names, helps = table_helps(source)
+    os.makedirs(directory, exist_ok=True)
+    with atomic_write(os.path.join(directory, DATA_FILE), 'w',
+                      encoding='utf-8') as f:
+        json.dump({'names': names, 'helps': helps}, f, ensure_ascii=False,
+                  separators=(',', ':'))
+    copy_scripts(directory)
+    return len(names)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cfvocab.webfilter',
+        description='Writes the data and scripts that search the standard '
+                    'name table page in a Web Worker.')
+    parser.add_argument('source', help='table XML file')
+    parser.add_argument('output', nargs='?',
+                        default=os.path.join('build', FILTER_DIR),
+                        help='script directory (default: build/%s)'
+                             % FILTER_DIR)
+    args = parser.parse_args(argv)
+    n = build_filter(args.source, args.output)
+    print('%s - wrote %d entries' % (args.output, n))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
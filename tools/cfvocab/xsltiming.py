@@ -0,0 +1,80 @@
+"""
+Times xsltproc renders of every standard name table version.
+
+Each version under the cf-standard-names directory is rendered with each of
+the given stylesheets, and the wall time of every render is reported along
+with the total per stylesheet. The output of the stylesheets is compared
+too, so a new stylesheet revision can be checked against the old one.
+"""
+
+import argparse
+import hashlib
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from .loader import iter_versions
+
+STYLESHEET_DIR = os.path.join('current', 'xsl', 'html')
+DEFAULT_STYLESHEETS = ('cf-standard-name-table-1.3.xsl',
+                       'cf-standard-name-table-1.4.xsl')
+
+
+def render(stylesheet, source, output):
+    """Run xsltproc and return its wall time in seconds."""
+    start = time.perf_counter()
+    with open(output, 'wb') as f:
+        subprocess.check_call(['xsltproc', stylesheet, source], stdout=f)
+    return time.perf_counter() - start
+
+
+def _digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m cfvocab.xsltiming',
+        description='Times the HTML render of every standard name table '
+                    'version with xsltproc.')
+    parser.add_argument('root', help='the cf-standard-names directory')
+    parser.add_argument('stylesheets', nargs='*',
+                        help='stylesheets to compare (default: %s in %s)'
+                             % (' and '.join(DEFAULT_STYLESHEETS),
+                                STYLESHEET_DIR))
+    args = parser.parse_args(argv)
+
+    stylesheets = args.stylesheets or [
+        os.path.join(args.root, STYLESHEET_DIR, name)
+        for name in DEFAULT_STYLESHEETS]
+    names = [os.path.basename(s) for s in stylesheets]
+    totals = [0.0] * len(stylesheets)
+    differ = []
+
+    print('%-8s %s' % ('version', ' '.join('%12s' % n[-12:] for n in names)))
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, source in iter_versions(args.root):
+            times = []
+            digests = set()
+            for i, stylesheet in enumerate(stylesheets):
+                output = os.path.join(tmp, '%d.html' % i)
+                times.append(render(stylesheet, source, output))
+                totals[i] += times[-1]
+                digests.add(_digest(output))
+            if len(digests) > 1:
+                differ.append(label)
+            print('%-8s %s' % (label, ' '.join('%11.3fs' % t for t in times)))
+
+    print('%-8s %s' % ('total', ' '.join('%11.3fs' % t for t in totals)))
+    if differ:
+        print('Output differs for versions: %s' % ' '.join(differ))
+        return 1
+    print('Output is identical for every version.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
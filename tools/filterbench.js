@@ -0,0 +1,134 @@
+// Headless benchmark of the standard name table search.
+//
+// Usage: node filterbench.js FILTER_DIR [ROUNDS]
+//
+// FILTER_DIR is the output of python -m cfvocab.webfilter, e.g. for the
+// current table. Each query, the category presets of the page and a few
+// typed ones, is run with and without help text by filterIndices from
+// filter.js and by a copy of the loop of applyFilter in
+// cf-standard-name-table-1.3.xsl, which builds its regexps for every row.
+// The median time of each is printed, and their matches must agree.
+
+var fs = require('fs');
+var path = require('path');
+
+var dir = process.argv[2];
+var rounds = parseInt(process.argv[3] || '20', 10);
+if (!dir)
+{
+    console.error('usage: node filterbench.js FILTER_DIR [ROUNDS]');
+    process.exit(2);
+}
+
+var filterIndices = require(path.resolve(dir, 'filter.js')).filterIndices;
+var data = JSON.parse(fs.readFileSync(path.join(dir, 'filter-data.json'), 'utf8'));
+var template = fs.readFileSync(path.join(__dirname, 'cfvocab', 'templates', 'cf-standard-name-table.html'), 'utf8');
+
+// applyFilter of the 1.3 stylesheet, reading ids and helps from arrays
+// instead of the DOM.
+function legacyFilter(names, helps, filter_text, is_boolean_and, search_help_text)
+{
+    var found = [];
+    if (filter_text.indexOf(' ') == -1)
+    {
+        var re = new RegExp(filter_text, 'i');
+    }
+    else
+    {
+        var string_parts = filter_text.split(' ');
+    }
+    for (var i = 0; i < names.length; i++)
+    {
+        var id = names[i] + '_tr';
+        var is_match;
+        if (filter_text.indexOf(' ') == -1)
+        {
+            is_match = id.substring(0, id.length - 3).match(re);
+            if (search_help_text)
+            {
+                is_match = is_match || helps[i].match(re);
+            }
+        }
+        else
+        {
+            var is_name_match = is_boolean_and;
+            for (var j = 0; j < string_parts.length && is_name_match == is_boolean_and; j++)
+            {
+                var text = is_boolean_and ? id : id.substring(0, id.length - 3);
+                is_name_match = !!text.match(new RegExp(string_parts[j], 'i'));
+            }
+            is_match = is_name_match;
+            if (search_help_text)
+            {
+                var is_help_match = is_boolean_and;
+                for (var j = 0; j < string_parts.length && is_help_match == is_boolean_and; j++)
+                {
+                    is_help_match = !!helps[i].match(new RegExp(string_parts[j], 'i'));
+                }
+                is_match = is_match || is_help_match;
+            }
+        }
+        if (is_match)
+        {
+            found.push(i);
+        }
+    }
+    return found;
+}
+
+function median(times)
+{
+    times.sort(function(a, b) { return a - b; });
+    return times[Math.floor(times.length / 2)];
+}
+
+function time(filter, query)
+{
+    var times = [];
+    var found;
+    for (var r = 0; r < rounds; r++)
+    {
+        var start = process.hrtime.bigint();
+        found = filter(data.names, data.helps, query[0], query[1], query[2]);
+        times.push(Number(process.hrtime.bigint() - start) / 1e6);
+    }
+    return {ms: median(times), found: found};
+}
+
+var queries = [];
+var preset = /getElementById\('filter_text'\)\.value='([^']*)';\s*document\.getElementById\('logical_operator_(and|or)'\)/g;
+var m;
+while ((m = preset.exec(template)))
+{
+    queries.push([m[1], m[2] == 'and']);
+}
+['air_temperature', 'sea_water.*temperature', 'carbon dioxide', 'tendency of mass'].forEach(function(q)
+{
+    queries.push([q, true]);
+});
+
+console.log(data.names.length + ' names, median of ' + rounds + ' rounds');
+console.log('  filter.js   legacy   matches  query');
+var failed = false;
+var total = [0, 0];
+queries.forEach(function(q)
+{
+    [false, true].forEach(function(search_help_text)
+    {
+        var query = [q[0], q[1], search_help_text];
+        var fast = time(filterIndices, query);
+        var slow = time(legacyFilter, query);
+        if (fast.found.join() != slow.found.join())
+        {
+            failed = true;
+            console.log('MISMATCH for ' + JSON.stringify(query));
+        }
+        total[0] += fast.ms;
+        total[1] += slow.ms;
+        var label = (q[1] ? 'AND ' : 'OR  ') + (search_help_text ? 'help ' : '     ') + q[0];
+        console.log(('       ' + fast.ms.toFixed(2)).slice(-9) + ('         ' + slow.ms.toFixed(2)).slice(-9)
+                    + ('         ' + fast.found.length).slice(-9) + '  ' + label.slice(0, 60));
+    });
+});
+console.log(('       ' + total[0].toFixed(1)).slice(-9) + ('         ' + total[1].toFixed(1)).slice(-9) + '           total');
+process.exit(failed ? 1 : 0);